@@ -1,7 +1,9 @@
 import os
+from contextlib import asynccontextmanager
 import click
 import uvicorn
-from grokipedia_mcp.server import mcp
+from grokipedia_mcp.config import settings
+from grokipedia_mcp.server import cache_admin_route, enable_admin, mcp, shared_context
 from starlette.middleware.cors import CORSMiddleware
 
 
@@ -25,16 +27,170 @@ from starlette.middleware.cors import CORSMiddleware
     default=None,
     help="Port to bind to for HTTP transports (default: PORT env or 8888)",
 )
-def main(transport: str, host: str, port: int | None):
+@click.option(
+    "--cache-ttl",
+    type=float,
+    default=None,
+    help="Seconds to keep fetched pages in memory, 0 disables (default: GROKIPEDIA_CACHE_TTL env or 3600)",
+)
+@click.option(
+    "--cache-max-mb",
+    type=float,
+    default=None,
+    help="Memory budget for cached pages in MiB (default: GROKIPEDIA_CACHE_MAX_MB env or 64)",
+)
+@click.option(
+    "--cache-size",
+    type=int,
+    default=None,
+    help="Maximum number of search results kept in memory (default: GROKIPEDIA_CACHE_MAX_ENTRIES env or 512)",
+)
+@click.option(
+    "--cache-stale-ttl",
+    type=float,
+    default=None,
+    help="Seconds an expired entry is still served while it is refreshed in the background, 0 disables (default: GROKIPEDIA_CACHE_STALE_TTL env or 0)",
+)
+@click.option(
+    "--max-refreshes",
+    type=int,
+    default=None,
+    help="Maximum concurrent background refreshes of stale entries (default: GROKIPEDIA_MAX_REFRESHES env or 8)",
+)
+@click.option(
+    "--negative-cache-ttl",
+    type=float,
+    default=None,
+    help="Seconds to remember slugs that were not found, 0 disables (default: GROKIPEDIA_NEGATIVE_CACHE_TTL env or 60)",
+)
+@click.option(
+    "--cache-db",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="SQLite file to persist pages and search results across restarts (default: GROKIPEDIA_CACHE_DB env, disabled)",
+)
+@click.option(
+    "--cache-db-ttl",
+    type=float,
+    default=None,
+    help="Seconds persisted entries stay valid (default: GROKIPEDIA_CACHE_DB_TTL env or 86400)",
+)
+@click.option(
+    "--warm-file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File of slugs (and 'search: <query>' lines) to prefetch into the cache at startup (default: GROKIPEDIA_WARM_FILE env)",
+)
+@click.option(
+    "--warm-concurrency",
+    type=int,
+    default=None,
+    help="Number of concurrent warm-up fetches (default: GROKIPEDIA_WARM_CONCURRENCY env or 8)",
+)
+@click.option(
+    "--parse-workers",
+    type=int,
+    default=None,
+    help="Threads that parse large pages off the event loop, 0 parses inline (default: GROKIPEDIA_PARSE_WORKERS env or 2)",
+)
+@click.option(
+    "--parse-threshold",
+    type=int,
+    default=None,
+    help="Page size in characters from which parsing moves to the worker threads (default: GROKIPEDIA_PARSE_THRESHOLD env or 262144)",
+)
+@click.option(
+    "--admin-token",
+    default=None,
+    help="Bearer token required by the /admin/cache HTTP route (default: GROKIPEDIA_ADMIN_TOKEN env, no token)",
+)
+@click.option(
+    "--link-graph-size",
+    type=int,
+    default=None,
+    help="Maximum number of pages whose links are kept for find_link_path, 0 disables (default: GROKIPEDIA_LINK_GRAPH_MAX_PAGES env or 50000)",
+)
+@click.option(
+    "--enable-admin",
+    "admin",
+    is_flag=True,
+    default=False,
+    help="Expose the cache_admin tool and the /admin/cache HTTP route (default: GROKIPEDIA_ENABLE_ADMIN env or off)",
+)
+def main(
+    transport: str,
+    host: str,
+    port: int | None,
+    cache_ttl: float | None,
+    cache_max_mb: float | None,
+    cache_size: int | None,
+    cache_stale_ttl: float | None,
+    max_refreshes: int | None,
+    negative_cache_ttl: float | None,
+    cache_db: str | None,
+    cache_db_ttl: float | None,
+    warm_file: str | None,
+    warm_concurrency: int | None,
+    parse_workers: int | None,
+    parse_threshold: int | None,
+    admin_token: str | None,
+    link_graph_size: int | None,
+    admin: bool,
+):
     transport = os.getenv("MCP_TRANSPORT", transport)
     
     if port is None:
         port = int(os.getenv("PORT", "8888"))
 
+    if cache_ttl is not None:
+        settings.cache_ttl = cache_ttl
+    if cache_max_mb is not None:
+        settings.cache_max_mb = cache_max_mb
+    if cache_size is not None:
+        settings.cache_max_entries = cache_size
+    if cache_stale_ttl is not None:
+        settings.cache_stale_ttl = cache_stale_ttl
+    if max_refreshes is not None:
+        settings.max_refreshes = max_refreshes
+    if negative_cache_ttl is not None:
+        settings.negative_cache_ttl = negative_cache_ttl
+    if cache_db is not None:
+        settings.cache_db = cache_db
+    if cache_db_ttl is not None:
+        settings.cache_db_ttl = cache_db_ttl
+    if warm_file is not None:
+        settings.warm_file = warm_file
+    if warm_concurrency is not None:
+        settings.warm_concurrency = warm_concurrency
+    if parse_workers is not None:
+        settings.parse_workers = parse_workers
+    if parse_threshold is not None:
+        settings.parse_threshold = parse_threshold
+    if admin_token is not None:
+        settings.admin_token = admin_token
+    if link_graph_size is not None:
+        settings.link_graph_max_pages = link_graph_size
+    if admin:
+        settings.enable_admin = True
+        enable_admin()
+
     if transport in ["sse", "streamable-http"]:
         click.echo(f"Starting {transport} server on {host}:{port}")
 
         app = mcp.streamable_http_app()
+        session_lifespan = app.router.lifespan_context
+
+        # Keep the shared client and cache alive between sessions instead of
+        # rebuilding them whenever the last open session closes.
+        @asynccontextmanager
+        async def lifespan(app):
+            async with shared_context(), session_lifespan(app):
+                yield
+
+        app.router.lifespan_context = lifespan
+
+        if settings.enable_admin:
+            app.add_route("/admin/cache", cache_admin_route, methods=["GET", "DELETE"])
 
         app.add_middleware(
             CORSMiddleware,
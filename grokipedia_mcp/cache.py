@@ -0,0 +1,376 @@
+import asyncio
+import importlib
+import json
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from grokipedia_mcp.outline import Chunk, LineIndex, Outline, SectionIndex, chunk_index_bytes
+
+# Page content shorter than this is kept as a plain string.
+COMPRESS_MIN_CHARS = 4096
+COMPRESS_LEVEL = 6
+
+# Chunk indexes kept per page, one per distinct chunk size; the oldest goes first.
+MAX_CHUNK_INDEXES = 4
+
+# Models rebuilt from the disk cache must come from the API client package.
+_MODEL_PACKAGE = "grokipedia_api_sdk"
+
+
+class TTLCache:
+    """Least-recently-used mapping whose entries expire after a fixed time-to-live.
+
+    The cache is bounded by ``max_entries``, by ``max_bytes`` as measured by
+    ``weigh``, or by both. Entries are fresh for ``ttl`` seconds, then kept as
+    stale for another ``stale_ttl`` seconds so callers can serve them while
+    revalidating. A non-positive ``ttl`` disables the cache entirely.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        stale_ttl: float = 0.0,
+        weigh: Callable[[Any], int] | None = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = max(0.0, stale_ttl)
+        self.weigh = weigh or (lambda value: 0)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (fresh_until, expires, weight, value)
+        self._data: OrderedDict[Hashable, tuple[float, float, int, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and (self.max_entries > 0 or self.max_bytes > 0)
+
+    def lookup(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Return ``(value, is_fresh)``, or None if the key is missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        fresh_until, expires, _, value = item
+        now = time.monotonic()
+        if expires <= now:
+            self.pop(key)
+            self.misses += 1
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value, fresh_until > now
+
+    def get(self, key: Hashable) -> Any | None:
+        item = self.lookup(key)
+        return None if item is None else item[0]
+
+    def set(self, key: Hashable, value: Any, age: float = 0.0) -> None:
+        """Store ``value``; ``age`` is how long ago it was fetched, e.g. when loaded from disk."""
+        if not self.enabled or age >= self.ttl + self.stale_ttl:
+            return
+        weight = self.weigh(value)
+        if self.max_bytes and weight > self.max_bytes:
+            self.pop(key)
+            return
+
+        self.pop(key)
+        fresh_until = time.monotonic() + self.ttl - age
+        self._data[key] = (fresh_until, fresh_until + self.stale_ttl, weight, value)
+        self.bytes += weight
+        self._shrink()
+
+    def reweigh(self, key: Hashable) -> None:
+        """Re-measure an entry that grew in place, evicting others if over budget."""
+        item = self._data.get(key)
+        if item is None:
+            return
+        fresh_until, expires, old, value = item
+        weight = self.weigh(value)
+        if weight == old:
+            return
+        if self.max_bytes and weight > self.max_bytes:
+            self.pop(key)
+            return
+        self._data[key] = (fresh_until, expires, weight, value)
+        self.bytes += weight - old
+        self._shrink()
+
+    def _shrink(self) -> None:
+        while (self.max_entries and len(self._data) > self.max_entries) or (
+            self.max_bytes and self.bytes > self.max_bytes
+        ):
+            _, (_, _, evicted, _) = self._data.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any | None:
+        item = self._data.pop(key, None)
+        if item is None:
+            return None
+        self.bytes -= item[2]
+        return item[3]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CachedPage:
+    """A found page, kept as metadata plus content stored compressed when large.
+
+    ``page`` is the API page model with its content stripped, so metadata-only
+    tools never touch the content. ``content`` decompresses on every access.
+
+    Indexes derived from the content are built on first use and counted in
+    ``size``; ``key`` is the slug the fetcher caches the entry under, so the
+    cache can re-weigh it. Only the page itself is persisted; derived indexes
+    are rebuilt on demand after loading. Indexes are built under a per-entry
+    lock, since tools build them on executor threads: concurrent callers wait
+    for one build instead of each making and counting their own.
+    """
+
+    def __init__(self, page: Any, has_content: bool):
+        content = (page.content or "") if has_content else ""
+        self.page = page.model_copy(update={"content": None})
+        self.has_content = has_content
+        self.key: str | None = None
+        self._lock = threading.RLock()
+        self._outline: Outline | None = None
+        self._lines: LineIndex | None = None
+        self._relevance: SectionIndex | None = None
+        self._chunk_indexes: dict[int, list[Chunk]] = {}
+        self._derived_bytes = 0
+        self.length = len(content)
+        self._content: str | bytes = content
+        if len(content) >= COMPRESS_MIN_CHARS:
+            packed = zlib.compress(content.encode(), COMPRESS_LEVEL)
+            if len(packed) < len(content):
+                self._content = packed
+        self._base_size = len(self.page.model_dump_json()) + sys.getsizeof(self._content)
+
+    def to_json(self) -> str:
+        page = self.page.model_copy(update={"content": self.content if self.has_content else None})
+        return json.dumps({"page": _dump_model(page), "has_content": self.has_content})
+
+    @classmethod
+    def from_json(cls, text: str) -> "CachedPage":
+        data = json.loads(text)
+        return cls(_load_model(data["page"]), has_content=bool(data["has_content"]))
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the entry, including indexes built so far."""
+        return self._base_size + self._derived_bytes
+
+    @property
+    def content(self) -> str:
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode()
+        return self._content
+
+    @property
+    def compressed(self) -> bool:
+        return isinstance(self._content, bytes)
+
+    @property
+    def outline(self) -> Outline:
+        """Section index of the content, built on first use and kept with the entry."""
+        if self._outline is None:
+            return self._derive("_outline", lambda: Outline(self.content))
+        return self._outline
+
+    @property
+    def lines(self) -> LineIndex:
+        """Line and paragraph offsets of the content, built on first use."""
+        if self._lines is None:
+            return self._derive("_lines", lambda: LineIndex(self.content))
+        return self._lines
+
+    @property
+    def relevance(self) -> SectionIndex:
+        """BM25 index of the sections, built on first use and kept with the entry."""
+        if self._relevance is None:
+            return self._derive("_relevance", lambda: SectionIndex(self.outline, self.content))
+        return self._relevance
+
+    def _derive(self, name: str, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            index = getattr(self, name)
+            if index is None:
+                index = build()
+                setattr(self, name, index)
+                self._derived_bytes += index.nbytes
+            return index
+
+    def chunks(self, max_chars: int) -> list[Chunk]:
+        """Chunk index for a size limit, built on first use and kept with the entry."""
+        index = self._chunk_indexes.get(max_chars)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._chunk_indexes.get(max_chars)
+            if index is None:
+                index = self.outline.chunks(self.content, max_chars)
+                while len(self._chunk_indexes) >= MAX_CHUNK_INDEXES:
+                    dropped = self._chunk_indexes.pop(next(iter(self._chunk_indexes)))
+                    self._derived_bytes -= chunk_index_bytes(dropped)
+                self._chunk_indexes[max_chars] = index
+                self._derived_bytes += chunk_index_bytes(index)
+            return index
+
+
+class SearchWindow:
+    """Search results fetched so far for one query, indexed by absolute position.
+
+    Rows from different ``(offset, limit)`` requests accumulate here, and
+    ``end`` records the total number of results once an upstream call comes
+    back short, so any window inside the fetched ranges is served locally.
+    """
+
+    def __init__(self):
+        self.rows: dict[int, Any] = {}
+        self.end: int | None = None
+        self.fetched_at = time.time()
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def missing(self, offset: int, count: int) -> tuple[int, int] | None:
+        """Smallest ``(start, stop)`` range that still has to be fetched for a window."""
+        stop = offset + count if self.end is None else min(offset + count, self.end)
+        gaps = [i for i in range(offset, stop) if i not in self.rows]
+        if not gaps:
+            return None
+        return gaps[0], gaps[-1] + 1
+
+    def add(self, offset: int, count: int, rows: list) -> None:
+        for i, row in enumerate(rows, offset):
+            self.rows[i] = row
+        if len(rows) < count:
+            end = offset + len(rows)
+            self.end = end if self.end is None else min(self.end, end)
+
+    def window(self, offset: int, count: int) -> list:
+        stop = offset + count if self.end is None else min(offset + count, self.end)
+        return [self.rows[i] for i in range(offset, stop) if i in self.rows]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "rows": [[i, _dump_model(row)] for i, row in self.rows.items()],
+                "end": self.end,
+                "fetched_at": self.fetched_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "SearchWindow":
+        data = json.loads(text)
+        window = cls()
+        window.rows = {int(i): _load_model(row) for i, row in data["rows"]}
+        window.end = None if data["end"] is None else int(data["end"])
+        window.fetched_at = float(data["fetched_at"])
+        return window
+
+    def spans(self) -> list[tuple[int, int]]:
+        """Contiguous ``(start, stop)`` ranges of the rows fetched so far."""
+        spans: list[tuple[int, int]] = []
+        for i in sorted(self.rows):
+            if spans and spans[-1][1] == i:
+                spans[-1] = (spans[-1][0], i + 1)
+            else:
+                spans.append((i, i + 1))
+        return spans
+
+
+def _dump_model(model: BaseModel) -> dict:
+    """JSON-safe form of an API model, tagged with its class for ``_load_model``."""
+    cls = type(model)
+    return {"type": f"{cls.__module__}:{cls.__qualname__}", "data": model.model_dump(mode="json")}
+
+
+def _load_model(data: dict) -> BaseModel:
+    """Rebuild a model written by ``_dump_model``; only API client models are accepted."""
+    module_name, _, name = data["type"].partition(":")
+    if module_name != _MODEL_PACKAGE and not module_name.startswith(_MODEL_PACKAGE + "."):
+        raise ValueError(f"Unexpected model type {data['type']!r}")
+    cls: Any = importlib.import_module(module_name)
+    for part in name.split("."):
+        cls = getattr(cls, part)
+    if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+        raise ValueError(f"Unexpected model type {data['type']!r}")
+    return cls.model_validate(data["data"])
+
+
+@dataclass
+class MissingPage:
+    """A slug the API could not find, with the "did you mean" search results once computed."""
+
+    error: Exception | None = None
+    suggestions: list | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into a single upstream call.
+
+    Every caller awaiting the same key receives the same result, or the same
+    exception. A caller that is cancelled does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def pending(self, key: Hashable) -> asyncio.Task | None:
+        return self._calls.get(key)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter went away.
+            task.exception()
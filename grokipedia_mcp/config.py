@@ -0,0 +1,41 @@
+import os
+from dataclasses import dataclass, field
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+@dataclass
+class Settings:
+    """Runtime tuning knobs, read from the environment and overridable from the CLI."""
+
+    cache_ttl: float = field(default_factory=lambda: _env_float("GROKIPEDIA_CACHE_TTL", 3600.0))
+    cache_max_mb: float = field(default_factory=lambda: _env_float("GROKIPEDIA_CACHE_MAX_MB", 64.0))
+    cache_max_entries: int = field(default_factory=lambda: _env_int("GROKIPEDIA_CACHE_MAX_ENTRIES", 512))
+    cache_stale_ttl: float = field(default_factory=lambda: _env_float("GROKIPEDIA_CACHE_STALE_TTL", 0.0))
+    max_refreshes: int = field(default_factory=lambda: _env_int("GROKIPEDIA_MAX_REFRESHES", 8))
+    negative_cache_ttl: float = field(default_factory=lambda: _env_float("GROKIPEDIA_NEGATIVE_CACHE_TTL", 60.0))
+    negative_cache_max_entries: int = field(
+        default_factory=lambda: _env_int("GROKIPEDIA_NEGATIVE_CACHE_MAX_ENTRIES", 256)
+    )
+    cache_db: str | None = field(default_factory=lambda: os.getenv("GROKIPEDIA_CACHE_DB") or None)
+    cache_db_ttl: float = field(default_factory=lambda: _env_float("GROKIPEDIA_CACHE_DB_TTL", 86400.0))
+    warm_file: str | None = field(default_factory=lambda: os.getenv("GROKIPEDIA_WARM_FILE") or None)
+    warm_concurrency: int = field(default_factory=lambda: _env_int("GROKIPEDIA_WARM_CONCURRENCY", 8))
+    parse_workers: int = field(default_factory=lambda: _env_int("GROKIPEDIA_PARSE_WORKERS", 2))
+    parse_threshold: int = field(default_factory=lambda: _env_int("GROKIPEDIA_PARSE_THRESHOLD", 262144))
+    link_graph_max_pages: int = field(default_factory=lambda: _env_int("GROKIPEDIA_LINK_GRAPH_MAX_PAGES", 50000))
+    enable_admin: bool = field(default_factory=lambda: _env_bool("GROKIPEDIA_ENABLE_ADMIN", False))
+    admin_token: str | None = field(default_factory=lambda: os.getenv("GROKIPEDIA_ADMIN_TOKEN") or None)
+
+
+settings = Settings()
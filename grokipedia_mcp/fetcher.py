@@ -0,0 +1,447 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from grokipedia_api_sdk import AsyncClient
+from grokipedia_api_sdk.exceptions import GrokipediaNotFoundError
+
+from grokipedia_mcp.cache import CachedPage, MissingPage, SearchWindow, SingleFlight, TTLCache
+from grokipedia_mcp.graph import LinkGraph, linked_slugs, shortest_path
+from grokipedia_mcp.store import DiskStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Warm-up search lines fetch what a default `search` call asks for.
+WARM_SEARCH_LIMIT = 24
+
+# How each kind of value is written to the disk store and read back from it.
+_CODECS: dict[str, tuple[Callable[[Any], str], Callable[[str], Any]]] = {
+    "page": (CachedPage.to_json, CachedPage.from_json),
+    "search": (SearchWindow.to_json, SearchWindow.from_json),
+    "links": (lambda targets: json.dumps(list(targets)), lambda text: tuple(map(str, json.loads(text)))),
+}
+
+
+def search_key(query: str) -> str:
+    """Normalize a search query into its cache key."""
+    return " ".join(query.split()).casefold()
+
+
+def read_warm_file(path: str | Path) -> tuple[list[str], list[str]]:
+    """Parse a warm-up list into ``(slugs, queries)``.
+
+    One entry per line: a bare line is a page slug, a line starting with
+    ``search:`` is a search query. Blank lines and ``#`` comments are ignored.
+    """
+    slugs, queries = [], []
+    for line in Path(path).expanduser().read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("search:"):
+            query = line.removeprefix("search:").strip()
+            if query:
+                queries.append(query)
+        else:
+            slugs.append(line)
+    return slugs, queries
+
+
+class Fetcher:
+    """Front door to the Grokipedia API that every tool goes through.
+
+    Stale cache entries are served immediately while a background task
+    refreshes them; at most ``max_refreshes`` such tasks run at once and any
+    extra stale hits simply wait for a later request to trigger their refresh.
+
+    CPU-heavy work on pages of at least ``offload_chars`` characters, such as
+    compressing a fetched page or building its outline, runs on ``executor``
+    so a huge article does not stall the event loop for every other session.
+
+    The outgoing links of every fetched page are recorded in ``graph`` (and in
+    the store, when there is one) for link-path queries.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        pages: TTLCache,
+        misses: TTLCache,
+        searches: TTLCache,
+        store: DiskStore | None = None,
+        max_refreshes: int = 8,
+        executor: Executor | None = None,
+        offload_chars: int = 0,
+        graph: LinkGraph | None = None,
+    ):
+        self.client = client
+        self.pages = pages
+        self.misses = misses
+        self.searches = searches
+        self.store = store
+        self.max_refreshes = max_refreshes
+        self.executor = executor
+        self.offload_chars = offload_chars
+        self.graph = graph if graph is not None else LinkGraph()
+        if self.store is not None and self.graph.enabled:
+            for slug, text in self.store.items("links"):
+                targets = self._decode("links", slug, text)
+                if targets is not None:
+                    self.graph.add(slug, targets)
+        self.inflight = SingleFlight()
+        self._refreshes: set[asyncio.Task] = set()
+        self._warmup: asyncio.Task | None = None
+
+    async def aclose(self) -> None:
+        """Cancel outstanding background refreshes and warm-up."""
+        tasks = list(self._refreshes)
+        if self._warmup is not None:
+            tasks.append(self._warmup)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _lookup(self, cache: TTLCache, kind: str, key: str) -> tuple[Any, bool] | None:
+        item = cache.lookup(key)
+        if item is None:
+            item = self._load(cache, kind, key)
+        return item
+
+    def _load(self, cache: TTLCache, kind: str, key: str) -> tuple[Any, bool] | None:
+        """Promote a persisted entry into ``cache``, returning ``(value, is_fresh)``.
+
+        An entry older than the cache's fresh and stale windows together is a
+        miss, so the disk never serves what memory would already have dropped.
+        """
+        if self.store is None:
+            return None
+        hit = self.store.get(kind, key)
+        if hit is None:
+            return None
+        text, age = hit
+        if age >= cache.ttl + cache.stale_ttl:
+            return None
+        value = self._decode(kind, key, text)
+        if value is None:
+            return None
+        if kind == "page":
+            value.key = key
+        cache.set(key, value, age=age)
+        if kind == "page" and self.graph.enabled and key not in self.graph:
+            self.graph.add(key, linked_slugs(value.page.linked_pages))
+        return value, age < cache.ttl
+
+    def _remember(self, cache: TTLCache, kind: str, key: str, value: Any, age: float = 0.0) -> None:
+        cache.set(key, value, age=age)
+        if self.store is not None:
+            self.store.put(kind, key, _CODECS[kind][0](value), age=age)
+
+    def _decode(self, kind: str, key: str, text: str) -> Any:
+        """Rebuild a persisted value, or None if it cannot be read back."""
+        try:
+            return _CODECS[kind][1](text)
+        except Exception as e:
+            # Written by an incompatible version; treat it as a miss.
+            logger.debug("Ignoring unreadable %s entry %r in the disk cache: %s", kind, key, e)
+            return None
+
+    def _revalidate(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> None:
+        if self.inflight.pending(key) is not None or len(self._refreshes) >= self.max_refreshes:
+            return
+        task = asyncio.ensure_future(self.inflight.do(key, fn))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    async def offload(self, size: int, fn: Callable[[], T]) -> T:
+        """Run ``fn`` on the executor for content of ``size`` chars past the threshold, else inline."""
+        if self.executor is None or size < self.offload_chars:
+            return fn()
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn)
+
+    async def derive(self, entry: CachedPage, fn: Callable[[], T]) -> T:
+        """Run ``fn``, which may build indexes on ``entry``, and re-weigh the entry in the cache."""
+        result = await self.offload(entry.length, fn)
+        if entry.key is not None:
+            self.pages.reweigh(entry.key)
+        return result
+
+    async def get_page(self, slug: str, include_content: bool = True) -> CachedPage | None:
+        """Fetch a page, or None if it does not exist.
+
+        A full page is treated as a superset of the metadata-only one:
+        metadata-only lookups are answered from a cached or in-flight full fetch
+        when there is one, and a cached metadata-only entry is upgraded the first
+        time content is requested. The negative cache is checked before the
+        disk, so a page found to be gone is not served again from the store.
+        """
+        item = self.pages.lookup(slug)
+        miss = None
+        if item is None:
+            miss = self.misses.get(slug)
+            if miss is None:
+                item = self._load(self.pages, "page", slug)
+        if item is not None:
+            cached, fresh = item
+            if cached.has_content or not include_content:
+                if not fresh:
+                    has_content = cached.has_content
+                    self._revalidate(
+                        ("page", slug, has_content), lambda: self._fetch_page(slug, has_content)
+                    )
+                return cached
+
+        if miss is None and item is not None:
+            miss = self.misses.get(slug)
+        if miss is not None:
+            if miss.error is not None:
+                raise miss.error.with_traceback(None)
+            return None
+
+        if not include_content and self.inflight.pending(("page", slug, True)):
+            include_content = True
+
+        return await self.inflight.do(
+            ("page", slug, include_content), lambda: self._fetch_page(slug, include_content)
+        )
+
+    async def _fetch_page(self, slug: str, include_content: bool) -> CachedPage | None:
+        try:
+            result = await self.client.get_page(slug=slug, include_content=include_content)
+        except GrokipediaNotFoundError as e:
+            self._forget_page(slug, MissingPage(error=e))
+            raise
+
+        if not result.found or result.page is None:
+            self._forget_page(slug, MissingPage())
+            return None
+
+        size = len(result.page.content or "") if include_content else 0
+        entry = await self.offload(size, lambda: CachedPage(result.page, has_content=include_content))
+        entry.key = slug
+        self._record_links(slug, entry)
+        current = self.pages.get(slug)
+        if include_content or current is None or not current.has_content:
+            self._remember(self.pages, "page", slug, entry)
+        return entry
+
+    def _forget_page(self, slug: str, miss: MissingPage) -> None:
+        """Drop a page that no longer exists from every layer and remember the miss."""
+        self.pages.pop(slug)
+        self.graph.discard(slug)
+        if self.store is not None:
+            self.store.delete("page", slug)
+            self.store.delete("links", slug)
+        self.misses.set(slug, miss)
+
+    def _record_links(self, slug: str, entry: CachedPage) -> None:
+        if not self.graph.enabled:
+            return
+        targets = linked_slugs(entry.page.linked_pages)
+        if self.graph.links(slug) != targets:
+            self.graph.add(slug, targets)
+            if self.store is not None:
+                self.store.put("links", slug, _CODECS["links"][0](targets))
+
+    async def link_path(
+        self, source: str, target: str, max_hops: int = 6, max_fetches: int = 50, concurrency: int = 8
+    ) -> tuple[list[str] | None, int]:
+        """Shortest link path between two slugs over the recorded link graph.
+
+        Pages on the forward frontier that are not in the graph yet are fetched
+        concurrently, at most ``max_fetches`` in total. Returns the path (None
+        if there is none within ``max_hops``) and the number of pages fetched.
+        """
+        fetched = 0
+
+        async def expand(slugs: list[str]) -> None:
+            nonlocal fetched
+            slugs = slugs[:max_fetches - fetched]
+            fetched += len(slugs)
+            if slugs:
+                results = await self.get_pages(slugs, include_content=False, concurrency=concurrency)
+                for slug, entry in results.items():
+                    # Cached pages may predate the graph or have been dropped from it.
+                    if isinstance(entry, CachedPage) and slug not in self.graph:
+                        self._record_links(slug, entry)
+
+        path = await shortest_path(self.graph, source, target, expand, max_hops)
+        return path, fetched
+
+    def stats(self) -> dict:
+        return {
+            "pages": self.pages.stats(),
+            "searches": self.searches.stats(),
+            "not_found": self.misses.stats(),
+            "inflight": len(self.inflight),
+            "refreshes": len(self._refreshes),
+            "link_graph": self.graph.stats(),
+            "disk": None if self.store is None else self.store.stats(),
+        }
+
+    def evict(self, slug: str | None = None, query: str | None = None) -> dict:
+        """Drop one slug and/or one search query from every cache layer."""
+        evicted = {}
+        if slug is not None:
+            evicted["page"] = self.pages.pop(slug) is not None
+            evicted["not_found"] = self.misses.pop(slug) is not None
+            if self.store is not None:
+                self.store.delete("page", slug)
+        if query is not None:
+            key = search_key(query)
+            evicted["search"] = self.searches.pop(key) is not None
+            if self.store is not None:
+                self.store.delete("search", key)
+        return evicted
+
+    def clear(self) -> dict:
+        """Empty every cache layer."""
+        evicted = {
+            "page": len(self.pages),
+            "search": len(self.searches),
+            "not_found": len(self.misses),
+        }
+        self.pages.clear()
+        self.searches.clear()
+        self.misses.clear()
+        self.graph.clear()
+        if self.store is not None:
+            self.store.clear()
+        return evicted
+
+    async def search(self, query: str, limit: int = 12, offset: int = 0) -> list:
+        """Return up to ``limit`` search results starting at ``offset``.
+
+        Results are cached per normalized query as a SearchWindow, so paging
+        through or re-filtering a query only fetches rows not seen before.
+        """
+        key = search_key(query)
+        item = self._lookup(self.searches, "search", key)
+        if item is not None:
+            window, fresh = item
+            if window.missing(offset, limit) is None:
+                if not fresh:
+                    self._revalidate(
+                        ("search", key, "refresh"), lambda: self._refresh_search(key, query, window)
+                    )
+                return window.window(offset, limit)
+
+        while True:
+            window = self.searches.get(key)
+            gap = (offset, offset + limit) if window is None else window.missing(offset, limit)
+            if gap is None:
+                return window.window(offset, limit)
+            start, stop = gap
+            window = await self.inflight.do(
+                ("search", key, start, stop), lambda: self._fetch_search(key, query, start, stop)
+            )
+            if window.missing(offset, limit) is None:
+                return window.window(offset, limit)
+
+    async def _fetch_search(self, key: str, query: str, start: int, stop: int):
+        result = await self.client.search(query=query, limit=stop - start, offset=start)
+        window = self.searches.get(key)
+        if window is None:
+            window = SearchWindow()
+        window.add(start, stop - start, list(result.results))
+        self._remember(self.searches, "search", key, window, age=window.age)
+        return window
+
+    async def _refresh_search(self, key: str, query: str, stale: SearchWindow):
+        """Refetch every range ``stale`` knows about into a new window.
+
+        A range ending at the known end of the results asks for one row more,
+        so the end is found again, or moved if the results have grown.
+        """
+        spans = [
+            (start, stop + 1 if stop == stale.end else stop) for start, stop in stale.spans()
+        ]
+        if stale.end == 0:
+            spans.append((0, 1))
+        results = await asyncio.gather(
+            *(self.client.search(query=query, limit=stop - start, offset=start) for start, stop in spans)
+        )
+        window = SearchWindow()
+        for (start, stop), result in zip(spans, results):
+            window.add(start, stop - start, list(result.results))
+        self._remember(self.searches, "search", key, window)
+        return window
+
+    async def suggest(self, slug: str) -> list:
+        """Search results to offer as alternatives for a slug that was not found."""
+        miss = self.misses.get(slug)
+        if miss is not None and miss.suggestions is not None:
+            return miss.suggestions
+
+        suggestions = await self.search(query=slug, limit=5)
+        if miss is not None:
+            miss.suggestions = suggestions
+        return suggestions
+
+    async def get_pages(
+        self,
+        slugs: list[str],
+        include_content: bool = True,
+        concurrency: int = 8,
+        on_result: Callable[[str, CachedPage | Exception | None], Awaitable[None]] | None = None,
+    ) -> dict[str, CachedPage | Exception | None]:
+        """Fetch several pages with at most ``concurrency`` upstream calls at once.
+
+        Returns every distinct slug, in request order, mapped to its page, to
+        None when it does not exist, or to the exception its fetch raised, so
+        one bad slug never fails the others. ``on_result`` is awaited as each
+        slug completes.
+        """
+        results: dict[str, CachedPage | Exception | None] = dict.fromkeys(slugs)
+        jobs = iter(list(results))
+
+        async def worker():
+            for slug in jobs:
+                try:
+                    results[slug] = await self.get_page(slug, include_content=include_content)
+                except Exception as e:
+                    results[slug] = e
+                if on_result is not None:
+                    await on_result(slug, results[slug])
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(results))))))
+        return results
+
+    def start_warmup(self, slugs: list[str], queries: list[str], concurrency: int) -> None:
+        """Prefetch pages and searches in the background without blocking the caller."""
+        if self._warmup is None and (slugs or queries):
+            self._warmup = asyncio.ensure_future(self.warm(slugs, queries, concurrency))
+
+    async def warm(self, slugs: list[str], queries: list[str], concurrency: int) -> None:
+        jobs = iter(
+            [(self.get_page, slug, True) for slug in slugs]
+            + [(self.search, query, WARM_SEARCH_LIMIT) for query in queries]
+        )
+        failed = 0
+
+        async def worker():
+            nonlocal failed
+            for fn, *args in jobs:
+                try:
+                    await fn(*args)
+                except Exception as e:
+                    failed += 1
+                    logger.debug("Warm-up of %r failed: %s", args[0], e)
+
+        started = time.monotonic()
+        logger.info("Warming cache with %d pages and %d searches", len(slugs), len(queries))
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        logger.info(
+            "Cache warm-up finished in %.1fs (%d failed)", time.monotonic() - started, failed
+        )
@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+
+
+def linked_page(item) -> tuple[str, str]:
+    """``(slug, title)`` of a ``linked_pages`` entry, which is a dict or a bare string."""
+    if isinstance(item, dict):
+        slug = str(item.get("slug") or "")
+        return slug, str(item.get("title") or slug)
+    return str(item), str(item)
+
+
+def linked_slugs(linked_pages: Iterable | None) -> tuple[str, ...]:
+    """Distinct non-empty slugs of a page's ``linked_pages``, in order."""
+    return tuple(dict.fromkeys(slug for slug, _ in map(linked_page, linked_pages or []) if slug))
+
+
+class LinkGraph:
+    """Outgoing links of every page fetched so far, with a reverse index.
+
+    Pages are recorded as they are fetched, so the graph grows passively. It
+    is bounded by ``max_pages``, dropping the pages recorded longest ago; a
+    non-positive ``max_pages`` disables it.
+    """
+
+    def __init__(self, max_pages: int = 0):
+        self.max_pages = max_pages
+        self._links: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._backlinks: dict[str, set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_pages > 0
+
+    def add(self, slug: str, targets: tuple[str, ...]) -> None:
+        if not self.enabled:
+            return
+        self.discard(slug)
+        self._links[slug] = targets
+        for target in targets:
+            self._backlinks.setdefault(target, set()).add(slug)
+        while len(self._links) > self.max_pages:
+            self.discard(next(iter(self._links)))
+
+    def discard(self, slug: str) -> None:
+        for target in self._links.pop(slug, ()):
+            sources = self._backlinks.get(target)
+            if sources is not None:
+                sources.discard(slug)
+                if not sources:
+                    del self._backlinks[target]
+
+    def links(self, slug: str) -> tuple[str, ...] | None:
+        """Outgoing links of ``slug``, or None if the page has not been recorded."""
+        return self._links.get(slug)
+
+    def backlinks(self, slug: str) -> set[str]:
+        """Recorded pages that link to ``slug``."""
+        return self._backlinks.get(slug, set())
+
+    def clear(self) -> None:
+        self._links.clear()
+        self._backlinks.clear()
+
+    def stats(self) -> dict:
+        return {
+            "pages": len(self._links),
+            "links": sum(len(targets) for targets in self._links.values()),
+            "max_pages": self.max_pages,
+        }
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self._links
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+
+async def shortest_path(
+    graph: LinkGraph,
+    source: str,
+    target: str,
+    expand: Callable[[list[str]], Awaitable[None]],
+    max_hops: int,
+) -> list[str] | None:
+    """Shortest known chain of links from ``source`` to ``target``, or None.
+
+    Bidirectional breadth-first search, one whole level at a time, always
+    growing the smaller frontier. The forward side follows outgoing links and
+    calls ``expand`` with frontier pages not yet in the graph so they can be
+    fetched; the backward side only follows the reverse index, since pages
+    linking to a slug cannot be looked up. Gives up after ``max_hops`` links.
+
+    The reverse index only knows recorded pages, so the first meeting of the
+    two searches can overshoot; it is then shortened by a plain search over
+    everything recorded by that point. A shorter path through pages nobody
+    has fetched yet can still exist: finding it for certain would mean a
+    full forward crawl, which is what the reverse index is there to avoid.
+    """
+    if source == target:
+        return [source]
+
+    forward: dict[str, tuple[str | None, int]] = {source: (None, 0)}
+    backward: dict[str, tuple[str | None, int]] = {target: (None, 0)}
+    forward_frontier, backward_frontier = [source], [target]
+
+    for _ in range(max_hops):
+        if not forward_frontier and not backward_frontier:
+            return None
+        grow_backward = bool(backward_frontier) and (
+            not forward_frontier or len(backward_frontier) < len(forward_frontier)
+        )
+        if grow_backward:
+            seen, other, frontier = backward, forward, backward_frontier
+            neighbours = lambda slug: sorted(graph.backlinks(slug))
+        else:
+            missing = [slug for slug in forward_frontier if slug not in graph]
+            if missing:
+                await expand(missing)
+            seen, other, frontier = forward, backward, forward_frontier
+            neighbours = lambda slug: graph.links(slug) or ()
+
+        next_frontier = []
+        meetings = []
+        for slug in frontier:
+            depth = seen[slug][1] + 1
+            for neighbour in neighbours(slug):
+                if neighbour in seen:
+                    continue
+                seen[neighbour] = (slug, depth)
+                next_frontier.append(neighbour)
+                if neighbour in other:
+                    meetings.append(neighbour)
+
+        if meetings:
+            meet = min(meetings, key=lambda slug: forward[slug][1] + backward[slug][1])
+            path = _join(forward, backward, meet)
+            return _known_path(graph, source, target, len(path) - 2) or path
+
+        if grow_backward:
+            backward_frontier = next_frontier
+        else:
+            forward_frontier = next_frontier
+
+    return None
+
+
+def _known_path(graph: LinkGraph, source: str, target: str, max_hops: int) -> list[str] | None:
+    """Shortest path of at most ``max_hops`` links using recorded pages only."""
+    parents: dict[str, str | None] = {source: None}
+    frontier = [source]
+    for _ in range(max_hops):
+        next_frontier = []
+        for slug in frontier:
+            for neighbour in graph.links(slug) or ():
+                if neighbour in parents:
+                    continue
+                parents[neighbour] = slug
+                if neighbour == target:
+                    path = [target]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                next_frontier.append(neighbour)
+        frontier = next_frontier
+    return None
+
+
+def _join(forward: dict, backward: dict, meet: str) -> list[str]:
+    path = []
+    slug = meet
+    while slug is not None:
+        path.append(slug)
+        slug = forward[slug][0]
+    path.reverse()
+    slug = backward[meet][0]
+    while slug is not None:
+        path.append(slug)
+        slug = backward[slug][0]
+    return path
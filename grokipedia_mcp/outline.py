@@ -0,0 +1,446 @@
+import bisect
+import difflib
+import hashlib
+import math
+import re
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Minimum difflib similarity for an approximate header match.
+FUZZY_CUTOFF = 0.75
+
+# BM25 term-frequency saturation and length normalisation.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rough stand-in for a BPE tokenizer: every word and every punctuation mark
+# counts as one token, which tracks real counts for English prose closely.
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str, start: int = 0, end: int | None = None) -> int:
+    """Approximate token count of ``text[start:end]`` without copying it."""
+    return sum(1 for _ in _TOKEN.finditer(text, start, len(text) if end is None else end))
+
+
+@dataclass
+class Section:
+    """One markdown header of an article and the character span it covers.
+
+    ``start`` is the offset of the header line and ``end`` the offset of the
+    next header at the same or a higher level (or the end of the article), so
+    ``content[start:end]`` is the section including its subsections.
+    ``body_end`` is where the next listed header of any level starts, and
+    ``tokens`` estimates the size of ``content[start:body_end]``.
+    """
+
+    index: int
+    header: str
+    level: int
+    start: int
+    end: int
+    parent: int | None = None
+    children: list[int] = field(default_factory=list)
+    body_end: int = 0
+    tokens: int = 0
+
+
+@dataclass
+class Segment:
+    """A contiguous, non-overlapping piece of an article used for packing."""
+
+    label: str
+    start: int
+    end: int
+    tokens: int
+
+
+@dataclass
+class Chunk:
+    """A bounded slice of an article that starts on a section boundary."""
+
+    id: str
+    section: str
+    start: int
+    end: int
+    tokens: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+class Outline:
+    """Section tree of an article, parsed once and looked up by header."""
+
+    def __init__(self, content: str):
+        self.length = len(content)
+        self.sections = _parse(content)
+        self._by_header: dict[str, Section] = {}
+        for section in self.sections:
+            self._by_header.setdefault(section.header.lower(), section)
+
+        self._starts = [section.start for section in self.sections]
+
+        self.lead_end = self.sections[0].start if self.sections else self.length
+        self.lead_tokens = estimate_tokens(content, 0, self.lead_end)
+        for section, following in zip(self.sections, [*self.sections[1:], None]):
+            section.body_end = self.length if following is None else following.start
+            section.tokens = estimate_tokens(content, section.start, section.body_end)
+
+        # Approximate memory held by the outline, for cache accounting.
+        self.nbytes = (
+            sys.getsizeof(self.sections)
+            + sys.getsizeof(self._by_header)
+            + sys.getsizeof(self._starts)
+            + sum(_object_bytes(section) + sys.getsizeof(section.header) for section in self.sections)
+        )
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def find(self, header: str) -> Section | None:
+        """First section whose header matches ``header``, ignoring case."""
+        return self._by_header.get(header.strip().lower())
+
+    def section_at(self, offset: int) -> Section | None:
+        """Innermost section containing ``offset``, or None inside the lead."""
+        position = bisect.bisect_right(self._starts, offset)
+        return self.sections[position - 1] if position else None
+
+    def resolve(self, ref: str | int) -> Section | None:
+        """Find a section by position, header, header path, prefix or close match.
+
+        ``ref`` may be a 1-based position in the outline, the exact header
+        (ignoring case), a path of headers such as ``"Career/Early career"``,
+        the start of a header, or an approximate spelling of one. Exact header
+        text wins, so a section titled e.g. "1984" is still found by name. A
+        blank ``ref`` matches nothing.
+        """
+        if isinstance(ref, int):
+            return self._at(ref)
+
+        section = self.find(ref)
+        if section is not None:
+            return section
+
+        query = ref.strip().lower()
+        if not query:
+            return None
+        if query.isdigit():
+            return self._at(int(query))
+        if "/" in query:
+            section = self._find_path([part.strip() for part in query.split("/") if part.strip()])
+            if section is not None:
+                return section
+
+        for section in self.sections:
+            if section.header.lower().startswith(query):
+                return section
+
+        close = difflib.get_close_matches(query, list(self._by_header), n=1, cutoff=FUZZY_CUTOFF)
+        return self._by_header[close[0]] if close else None
+
+    def candidates(self, ref: str | int, limit: int = 5) -> list[Section]:
+        """Sections ranked by how closely their header resembles ``ref``."""
+        query = str(ref).strip().lower().rsplit("/", 1)[-1]
+
+        def score(section: Section) -> float:
+            header = section.header.lower()
+            ratio = difflib.SequenceMatcher(None, query, header).ratio()
+            if query and (query in header or header in query):
+                ratio += 0.5
+            return ratio
+
+        return sorted(self.sections, key=score, reverse=True)[:limit]
+
+    def path(self, section: Section) -> str:
+        """Header path from the top of the outline, e.g. ``"Career/Early career"``."""
+        headers = [section.header]
+        while section.parent is not None:
+            section = self.sections[section.parent]
+            headers.append(section.header)
+        return "/".join(reversed(headers))
+
+    def segments(self, section: Section | None = None) -> list[Segment]:
+        """Pieces of the whole article, or of one section, in document order.
+
+        The article is split into its lead (the text before the first header)
+        and each section's own body, so no text is counted twice.
+        """
+        segments = []
+        if section is None:
+            if self.lead_end > 0:
+                segments.append(Segment("(lead)", 0, self.lead_end, self.lead_tokens))
+            members = self.sections
+        else:
+            members = []
+            for member in self.sections[section.index:]:
+                if member.start >= section.end:
+                    break
+                members.append(member)
+        segments.extend(Segment(self.path(s), s.start, s.body_end, s.tokens) for s in members)
+        return segments
+
+    def pack(
+        self, content: str, max_tokens: int, section: Section | None = None
+    ) -> tuple[str, list[Segment], list[Segment]]:
+        """Fit whole segments, in document order, into a token budget.
+
+        Segments that do not fit in what is left of the budget are skipped and
+        later, smaller ones are still considered. Returns the packed text and
+        the included and omitted segments.
+        """
+        included, omitted = [], []
+        remaining = max_tokens
+        for segment in self.segments(section):
+            if segment.tokens <= remaining:
+                included.append(segment)
+                remaining -= segment.tokens
+            else:
+                omitted.append(segment)
+        text = "\n\n".join(content[s.start:s.end].strip() for s in included)
+        return text, included, omitted
+
+    def chunks(self, content: str, max_chars: int) -> list[Chunk]:
+        """Split the article into chunks of at most ``max_chars`` characters.
+
+        Consecutive segments are merged while they fit, so every chunk starts
+        at a section boundary. A segment larger than ``max_chars`` is split at
+        paragraph, then line, then word breaks. Chunk ids combine the size
+        limit, the position and a hash of the text, so an id keeps pointing at
+        the same text and stops resolving once that text changes.
+        """
+        if max_chars <= 0:
+            raise ValueError(f"max_chars must be positive, got {max_chars}")
+        spans: list[tuple[str, int, int]] = []
+        for segment in self.segments():
+            if spans and segment.end - spans[-1][1] <= max_chars:
+                label, start, _ = spans[-1]
+                spans[-1] = (label, start, segment.end)
+            elif segment.end - segment.start <= max_chars:
+                spans.append((segment.label, segment.start, segment.end))
+            else:
+                spans.extend(
+                    (segment.label, start, end)
+                    for start, end in _split(content, segment.start, segment.end, max_chars)
+                )
+
+        chunks = []
+        for position, (label, start, end) in enumerate(spans):
+            digest = hashlib.blake2b(content[start:end].encode(), digest_size=4).hexdigest()
+            chunks.append(Chunk(
+                id=f"{max_chars}-{position}-{digest}",
+                section=label,
+                start=start,
+                end=end,
+                tokens=estimate_tokens(content, start, end),
+            ))
+        return chunks
+
+    def _at(self, position: int) -> Section | None:
+        if 1 <= position <= len(self.sections):
+            return self.sections[position - 1]
+        return None
+
+    def _find_path(self, parts: list[str]) -> Section | None:
+        if not parts:
+            return None
+        *ancestors, leaf = parts
+        for exact in (True, False):
+            for section in self.sections:
+                header = section.header.lower()
+                if not (header == leaf if exact else header.startswith(leaf)):
+                    continue
+                if self._has_ancestors(section, ancestors):
+                    return section
+        return None
+
+    def _has_ancestors(self, section: Section, ancestors: list[str]) -> bool:
+        """Whether ``ancestors`` appear, in order, along the section's parent chain."""
+        chain = []
+        while section.parent is not None:
+            section = self.sections[section.parent]
+            chain.append(section.header.lower())
+        chain.reverse()
+        position = 0
+        for wanted in ancestors:
+            while position < len(chain) and not chain[position].startswith(wanted):
+                position += 1
+            if position == len(chain):
+                return False
+            position += 1
+        return True
+
+
+class LineIndex:
+    """Start offsets of every line and paragraph, for mapping matches to context."""
+
+    def __init__(self, content: str):
+        self.length = len(content)
+        self.line_starts = array("q", [0])
+        self.line_starts.extend(match.end() for match in _NEWLINE.finditer(content))
+        self.paragraph_starts = array("q", [0])
+        self.paragraph_ends = array("q")
+        for match in _PARAGRAPH_BREAK.finditer(content):
+            self.paragraph_ends.append(match.start())
+            self.paragraph_starts.append(match.end())
+        self.paragraph_ends.append(self.length)
+        self.nbytes = sum(
+            sys.getsizeof(offsets)
+            for offsets in (self.line_starts, self.paragraph_starts, self.paragraph_ends)
+        )
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number of ``offset``."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def paragraph(self, offset: int) -> tuple[int, int]:
+        """``(start, end)`` of the paragraph containing ``offset``."""
+        position = max(0, bisect.bisect_right(self.paragraph_starts, offset) - 1)
+        return self.paragraph_starts[position], self.paragraph_ends[position]
+
+
+class SectionIndex:
+    """BM25 index over the lead and section bodies of an article.
+
+    Every segment from ``Outline.segments`` is one document, so a header's own
+    words count towards its section and the scores never double-count text
+    shared with subsections.
+
+    The index is an inverted one packed into flat arrays: a sorted array of
+    term hashes, and for each term a run of ``(segment, frequency)`` postings.
+    Hashes are process-local, so the index is never persisted.
+    """
+
+    def __init__(self, outline: Outline, content: str):
+        self.segments = outline.segments()
+        postings: dict[int, list[tuple[int, int]]] = {}
+        lengths = array("I")
+        for position, segment in enumerate(self.segments):
+            terms = Counter(_terms(content, segment.start, segment.end))
+            lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                postings.setdefault(hash(term), []).append((position, frequency))
+
+        self._lengths = lengths
+        self._average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        self._terms = array("q", sorted(postings))
+        self._offsets = array("I", [0])
+        self._postings = array("I")
+        self._frequencies = array("I")
+        for term in self._terms:
+            for position, frequency in postings[term]:
+                self._postings.append(position)
+                self._frequencies.append(frequency)
+            self._offsets.append(len(self._postings))
+
+        self.nbytes = sys.getsizeof(self.segments) + sum(
+            _object_bytes(segment) + sys.getsizeof(segment.label) for segment in self.segments
+        ) + sum(
+            sys.getsizeof(values)
+            for values in (self._lengths, self._terms, self._offsets, self._postings, self._frequencies)
+        )
+
+    def rank(self, query: str, limit: int | None = None) -> list[tuple[Segment, float]]:
+        """Segments matching any query term, best first, with their BM25 scores."""
+        count = len(self.segments)
+        scores: dict[int, float] = {}
+        for term in set(_terms(query)):
+            key = hash(term)
+            index = bisect.bisect_left(self._terms, key)
+            if index == len(self._terms) or self._terms[index] != key:
+                continue
+            start, end = self._offsets[index], self._offsets[index + 1]
+            frequency = end - start
+            weight = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for position, tf in zip(self._postings[start:end], self._frequencies[start:end]):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[position] / self._average_length)
+                scores[position] = scores.get(position, 0.0) + weight * tf * (BM25_K1 + 1) / (tf + norm)
+
+        scored = [(self.segments[position], score) for position, score in sorted(scores.items()) if score > 0]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored if limit is None else scored[:limit]
+
+
+def chunk_index_bytes(chunks: list[Chunk]) -> int:
+    """Approximate memory held by a chunk index, for cache accounting."""
+    return sys.getsizeof(chunks) + sum(
+        _object_bytes(chunk) + sys.getsizeof(chunk.id) + sys.getsizeof(chunk.section) for chunk in chunks
+    )
+
+
+def _object_bytes(obj) -> int:
+    """Size of a dataclass instance with its attribute dict and integer fields."""
+    return sys.getsizeof(obj) + sys.getsizeof(obj.__dict__) + 28 * len(obj.__dict__)
+
+
+_WORD = re.compile(r"\w+")
+
+
+def _terms(text: str, start: int = 0, end: int | None = None) -> list[str]:
+    """Lower-cased words of ``text[start:end]``, as indexed and queried."""
+    return [word.lower() for word in _WORD.findall(text, start, len(text) if end is None else end)]
+
+
+_NEWLINE = re.compile(r"\n")
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r]*\n\s*")
+
+
+def _split(content: str, start: int, end: int, max_chars: int) -> list[tuple[int, int]]:
+    """Break ``content[start:end]`` into spans of at most ``max_chars`` at natural breaks."""
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    spans = []
+    while end - start > max_chars:
+        limit = start + max_chars
+        cut = -1
+        for separator in ("\n\n", "\n", " "):
+            cut = content.rfind(separator, start + 1, limit)
+            if cut != -1:
+                cut += len(separator)
+                break
+        if cut == -1:
+            cut = limit
+        spans.append((start, cut))
+        start = cut
+    if start < end:
+        spans.append((start, end))
+    return spans
+
+
+# A header is any line starting with "#"; group 1 is the run of "#" marks.
+_HEADER = re.compile(r"^(#+)(.*)$", re.MULTILINE)
+
+
+def _parse(content: str) -> list[Section]:
+    """Single pass over the header lines only, using offsets into ``content``."""
+    sections: list[Section] = []
+    open_sections: list[Section] = []
+
+    for match in _HEADER.finditer(content):
+        level = len(match.group(1))
+        start = match.start()
+        while open_sections and open_sections[-1].level >= level:
+            open_sections.pop().end = start
+        header = match.group(2).strip()
+        if not header:
+            # A bare run of "#" still closes sections, but is not listed.
+            continue
+        parent = open_sections[-1] if open_sections else None
+        section = Section(
+            index=len(sections),
+            header=header,
+            level=level,
+            start=start,
+            end=len(content),
+            parent=None if parent is None else parent.index,
+        )
+        if parent is not None:
+            parent.children.append(section.index)
+        sections.append(section)
+        open_sections.append(section)
+
+    return sections
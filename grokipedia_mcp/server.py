@@ -1,11 +1,17 @@
-import re
+import asyncio
 import base64
+import hmac
+import json
+import logging
+import time
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated
 
+import regex
 from grokipedia_api_sdk import AsyncClient
 from grokipedia_api_sdk.exceptions import (
     GrokipediaAPIError,
@@ -18,17 +24,113 @@ from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.session import ServerSession
 from mcp.types import CallToolResult, Icon, TextContent, ToolAnnotations
 from pydantic import Field
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from grokipedia_mcp.cache import MAX_CHUNK_INDEXES, CachedPage, TTLCache
+from grokipedia_mcp.config import settings
+from grokipedia_mcp.fetcher import Fetcher, read_warm_file, search_key
+from grokipedia_mcp.graph import LinkGraph, linked_page
+from grokipedia_mcp.outline import Segment
+from grokipedia_mcp.store import DiskStore
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class AppContext:
     client: AsyncClient
+    fetcher: Fetcher
+
+
+_shared_lock = asyncio.Lock()
+_shared_stack: AsyncExitStack | None = None
+_shared_context: AppContext | None = None
+_shared_users = 0
+
+
+@asynccontextmanager
+async def shared_context() -> AsyncIterator[AppContext]:
+    """Hand out one client and cache to every session in the process.
+
+    The streamable-http transport runs the server lifespan once per session, so
+    the context is reference counted and torn down when the last user leaves.
+    """
+    global _shared_stack, _shared_context, _shared_users
+
+    async with _shared_lock:
+        if _shared_context is None:
+            # Read before anything is opened, so a bad file cannot leave
+            # half-built resources behind.
+            warm = None
+            if settings.warm_file:
+                try:
+                    warm = read_warm_file(settings.warm_file)
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning("Skipping warm-up file %s: %s", settings.warm_file, e)
+            stack = AsyncExitStack()
+            try:
+                client = await stack.enter_async_context(AsyncClient())
+                pages = TTLCache(
+                    ttl=settings.cache_ttl,
+                    max_bytes=int(settings.cache_max_mb * 1024 * 1024),
+                    stale_ttl=settings.cache_stale_ttl,
+                    weigh=lambda entry: entry.size,
+                )
+                misses = TTLCache(
+                    ttl=settings.negative_cache_ttl, max_entries=settings.negative_cache_max_entries
+                )
+                searches = TTLCache(
+                    ttl=settings.cache_ttl,
+                    max_entries=settings.cache_max_entries,
+                    stale_ttl=settings.cache_stale_ttl,
+                )
+                store = None
+                if settings.cache_db:
+                    store = DiskStore(settings.cache_db, ttl=settings.cache_db_ttl)
+                    stack.push_async_callback(asyncio.to_thread, store.close)
+                executor = None
+                if settings.parse_workers > 0:
+                    executor = ThreadPoolExecutor(
+                        max_workers=settings.parse_workers, thread_name_prefix="grokipedia-parse"
+                    )
+                    stack.callback(executor.shutdown, wait=False, cancel_futures=True)
+                fetcher = Fetcher(
+                    client,
+                    pages,
+                    misses,
+                    searches,
+                    store=store,
+                    max_refreshes=settings.max_refreshes,
+                    executor=executor,
+                    offload_chars=settings.parse_threshold,
+                    graph=LinkGraph(max_pages=settings.link_graph_max_pages),
+                )
+                stack.push_async_callback(fetcher.aclose)
+                if warm is not None:
+                    fetcher.start_warmup(*warm, concurrency=settings.warm_concurrency)
+            except BaseException:
+                await stack.aclose()
+                raise
+            _shared_stack = stack
+            _shared_context = AppContext(client=client, fetcher=fetcher)
+        _shared_users += 1
+        context = _shared_context
+
+    try:
+        yield context
+    finally:
+        async with _shared_lock:
+            _shared_users -= 1
+            if _shared_users == 0 and _shared_stack is not None:
+                stack, _shared_stack, _shared_context = _shared_stack, None, None
+                await stack.aclose()
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    async with AsyncClient() as client:
-        yield AppContext(client=client)
+    async with shared_context() as context:
+        yield context
 
 
 # Load the icon file and convert to data URI
@@ -68,10 +170,8 @@ async def search(
     await ctx.debug(f"Searching for: '{query}' (limit={limit}, offset={offset}, sort_by={sort_by})")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.search(query=query, limit=limit * 2, offset=offset)
-        
-        results = result.results
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        results = await fetcher.search(query=query, limit=limit * 2, offset=offset)
         
         if min_views is not None:
             results = [r for r in results if r.view_count >= min_views]
@@ -135,24 +235,26 @@ async def get_page(
     await ctx.debug(f"Fetching page: '{slug}'")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=True)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}', searching for alternatives")
-            search_result = await client.search(query=slug, limit=5)
-            if search_result.results:
-                suggestions = [f"{r.title} ({r.slug})" for r in search_result.results[:3]]
-                await ctx.info(f"Found {len(search_result.results)} similar pages")
+            similar = await fetcher.suggest(slug)
+            if similar:
+                suggestions = [f"{r.title} ({r.slug})" for r in similar[:3]]
+                await ctx.info(f"Found {len(similar)} similar pages")
                 raise ValueError(
                     f"Page not found: {slug}. Did you mean one of these? {', '.join(suggestions)}"
                 )
             raise ValueError(f"Page not found: {slug}")
 
-        await ctx.info(f"Retrieved page: '{result.page.title}' ({slug})")
+        page = cached.page
+        content = await fetcher.derive(cached, lambda: cached.content)
+
+        await ctx.info(f"Retrieved page: '{page.title}' ({slug})")
         
-        page = result.page
-        content_len = len(page.content) if page.content else 0
+        content_len = len(content)
         is_truncated = content_len > max_content_length
         
         text_parts = [
@@ -164,9 +266,9 @@ async def get_page(
         if page.description:
             text_parts.extend(["", f"**Description:** {page.description}", ""])
         
-        if page.content:
+        if content:
             preview_length = min(1000, max_content_length)
-            text_parts.extend(["", "## Content Preview", "", page.content[:preview_length]])
+            text_parts.extend(["", "## Content Preview", "", content[:preview_length]])
             if content_len > preview_length:
                 text_parts.append(f"\n... (showing first {preview_length} of {content_len} chars)")
         
@@ -178,8 +280,9 @@ async def get_page(
                 text_parts.append(f"... and {len(page.citations) - 5} more")
         
         page_dict = page.model_dump()
+        page_dict["content"] = content
         if is_truncated:
-            page_dict["content"] = page.content[:max_content_length]
+            page_dict["content"] = content[:max_content_length]
             page_dict["_content_truncated"] = True
             page_dict["_original_length"] = content_len
             await ctx.warning(
@@ -206,6 +309,116 @@ async def get_page(
         raise RuntimeError(f"Grokipedia API error: {e}") from e
 
 
+# Chunk sizes accepted by get_page_chunk_index, and therefore in chunk ids.
+MIN_CHUNK_CHARS = 200
+MAX_CHUNK_CHARS = 20000
+
+
+def _chunk_size(chunk_id: str) -> int | None:
+    """Size limit encoded in a chunk id, or None if it is malformed or out of range."""
+    size, _, _ = chunk_id.partition("-")
+    if not size.isdigit() or not MIN_CHUNK_CHARS <= int(size) <= MAX_CHUNK_CHARS:
+        return None
+    return int(size)
+
+
+# Longest pattern find_in_page accepts.
+MAX_PATTERN_CHARS = 200
+
+# Seconds a find_in_page regex may run before it is abandoned; a timeout
+# rather than a syntax check, since no static check catches every pattern
+# that backtracks badly.
+REGEX_TIMEOUT = 1.0
+
+
+def _compile_pattern(pattern: str, is_regex: bool, case_sensitive: bool) -> regex.Pattern:
+    if len(pattern) > MAX_PATTERN_CHARS:
+        raise ValueError(f"Pattern is too long: {len(pattern)} chars (max {MAX_PATTERN_CHARS})")
+    flags = 0 if case_sensitive else regex.IGNORECASE
+    if not is_regex:
+        return regex.compile(regex.escape(pattern), flags)
+    try:
+        return regex.compile(pattern, flags)
+    except regex.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from e
+
+
+# Reciprocal-rank fusion damping constant; 60 is the value from the original paper.
+RRF_K = 60
+
+
+def _fuse_rankings(rankings: dict[str, list], fusion: str) -> list[tuple[object, float, list[str]]]:
+    """Merge per-query result lists into one, deduplicated by slug.
+
+    With ``"rrf"`` results are ordered by reciprocal-rank fusion score; with
+    ``"concat"`` they keep the order of first appearance. Returns each result
+    with its score and the queries that found it.
+    """
+    merged: dict[str, list] = {}
+    for query, results in rankings.items():
+        for rank, result in enumerate(results, 1):
+            entry = merged.setdefault(result.slug, [result, 0.0, []])
+            entry[1] += 1.0 / (RRF_K + rank)
+            entry[2].append(query)
+    items = [tuple(entry) for entry in merged.values()]
+    if fusion == "rrf":
+        items.sort(key=lambda item: item[1], reverse=True)
+    return items
+
+
+async def _resolve_topic(fetcher: Fetcher, topic: str) -> tuple[CachedPage, str]:
+    """Fetch a topic given as a slug, falling back to its top search result.
+
+    Returns the page and how it was found, ``"slug"`` or ``"search"``.
+    """
+    slug = "_".join(topic.split())
+    try:
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+    except (GrokipediaNotFoundError, GrokipediaBadRequestError):
+        cached = None
+    if cached is not None:
+        return cached, "slug"
+
+    results = await fetcher.search(query=topic, limit=1)
+    if results:
+        cached = await fetcher.get_page(slug=results[0].slug, include_content=True)
+        if cached is not None:
+            return cached, "search"
+    raise ValueError(f"No page found for topic: {topic}")
+
+
+def _encode_cursor(slug: str, offset: int, total_length: int) -> str:
+    payload = json.dumps({"s": slug, "o": offset, "n": total_length}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {"slug": str(data["s"]), "offset": int(data["o"]), "total_length": int(data["n"])}
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _describe_packing(included: list[Segment], omitted: list[Segment], max_tokens: int) -> tuple[dict, str]:
+    """Structured fields and a trailing note describing a token-budget packing."""
+    used = sum(segment.tokens for segment in included)
+    fields = {
+        "max_tokens": max_tokens,
+        "token_estimate": used,
+        "included_sections": [segment.label for segment in included],
+        "omitted_sections": [segment.label for segment in omitted],
+    }
+    note = ""
+    if omitted:
+        note = (
+            f"\n\n... (~{used} of {max_tokens} tokens used; omitted {len(omitted)} sections: "
+            f"{', '.join(segment.label for segment in omitted)})"
+        )
+    return fields, note
+
+
 @mcp.tool(
     annotations=ToolAnnotations(
         readOnlyHint=True,
@@ -216,50 +429,105 @@ async def get_page(
 async def get_page_content(
     slug: Annotated[str, Field(description="Unique slug identifier of the page to retrieve content from")],
     max_length: Annotated[int, Field(description="Maximum length of content to return (default: 10000)", ge=100)] = 10000,
+    offset: Annotated[int, Field(description="Character offset to start reading from (default: 0)", ge=0)] = 0,
+    cursor: Annotated[str | None, Field(description="Continuation cursor from a previous call; overrides offset")] = None,
+    max_tokens: Annotated[int | None, Field(description="Approximate token budget; when set, whole sections are packed in document order instead of cutting at max_length (optional)", ge=1)] = None,
     ctx: Context[ServerSession, AppContext] | None = None,
 ) -> CallToolResult:
-    """Get only the article content without citations or metadata."""
+    """Get only the article content without citations or metadata, one window at a time."""
     if ctx is None:
         raise ValueError("Context is required")
 
-    await ctx.debug(f"Fetching content for: '{slug}'")
+    if max_tokens is not None and (offset or cursor is not None):
+        raise ValueError("max_tokens cannot be combined with offset or cursor")
+
+    expected_length = None
+    if cursor is not None:
+        position = _decode_cursor(cursor)
+        if position["slug"] != slug:
+            raise ValueError(f"Cursor belongs to page '{position['slug']}', not '{slug}'")
+        offset = position["offset"]
+        expected_length = position["total_length"]
+
+    await ctx.debug(f"Fetching content for: '{slug}' (offset={offset}, max_length={max_length})")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=True)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}'")
             raise ValueError(f"Page not found: {slug}")
 
-        page = result.page
-        content = page.content or ""
-        content_len = len(content)
-        is_truncated = content_len > max_length
+        page = cached.page
+        full_content = await fetcher.derive(cached, lambda: cached.content)
+        content_len = len(full_content)
+        if expected_length is not None and expected_length != content_len:
+            await ctx.warning(
+                f"Page '{slug}' changed since the cursor was issued "
+                f"({expected_length} -> {content_len} chars)"
+            )
+
+        if max_tokens is not None:
+            content, included, omitted = await fetcher.derive(
+                cached, lambda: cached.outline.pack(full_content, max_tokens)
+            )
+            packing, note = _describe_packing(included, omitted, max_tokens)
+            if omitted:
+                await ctx.warning(
+                    f"Token budget of {max_tokens} fits {len(included)} of "
+                    f"{len(included) + len(omitted)} sections"
+                )
+            await ctx.info(f"Retrieved content for: '{page.title}' ({content_len} chars)")
+            structured = {
+                "slug": page.slug,
+                "title": page.title,
+                "content": content,
+                "content_length": len(content),
+                "total_length": content_len,
+                **packing,
+            }
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"# {page.title}\n\n{content}{note}")],
+                structuredContent=structured,
+            )
+
+        end = offset + max_length
+        content = full_content[offset:end]
+        is_truncated = end < content_len
+        next_cursor = _encode_cursor(page.slug, end, content_len) if is_truncated else None
         
         if is_truncated:
-            content = content[:max_length]
             await ctx.warning(
                 f"Content truncated from {content_len} to {max_length} chars. "
-                f"Use max_length parameter to adjust."
+                f"Use the returned cursor to continue reading."
             )
         
         await ctx.info(f"Retrieved content for: '{page.title}' ({content_len} chars)")
         
         text_output = f"# {page.title}\n\n{content}"
+        if offset:
+            text_output = f"# {page.title}\n\n... (continuing at char {offset} of {content_len})\n\n{content}"
         if is_truncated:
-            text_output += f"\n\n... (truncated at {max_length} of {content_len} chars)"
+            text_output += (
+                f"\n\n... (truncated at {min(end, content_len)} of {content_len} chars; "
+                f"continue with cursor: {next_cursor})"
+            )
         
         structured = {
             "slug": page.slug,
             "title": page.title,
             "content": content,
             "content_length": len(content),
+            "offset": offset,
+            "total_length": content_len,
         }
         
         if is_truncated:
             structured["_truncated"] = True
             structured["_original_length"] = content_len
+            structured["next_offset"] = end
+            structured["next_cursor"] = next_cursor
         
         return CallToolResult(
             content=[TextContent(type="text", text=text_output)],
@@ -299,14 +567,14 @@ async def get_page_citations(
     await ctx.debug(f"Fetching citations for: '{slug}' (limit={limit})")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=False)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=False)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}'")
             raise ValueError(f"Page not found: {slug}")
 
-        page = result.page
+        page = cached.page
         all_citations = page.citations or []
         total_count = len(all_citations)
         
@@ -394,14 +662,14 @@ async def get_related_pages(
     await ctx.debug(f"Fetching related pages for: '{slug}' (limit={limit})")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=False)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=False)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}'")
             raise ValueError(f"Page not found: {slug}")
 
-        page = result.page
+        page = cached.page
         linked_pages = page.linked_pages or []
         total_count = len(linked_pages)
         
@@ -482,8 +750,9 @@ async def get_related_pages(
 )
 async def get_page_section(
     slug: Annotated[str, Field(description="Unique slug identifier of page to extract section from")],
-    section_header: Annotated[str, Field(description="Exact header text of the section to extract (case-insensitive)")],
+    section_header: Annotated[str, Field(description="Header of the section to extract: exact text (case-insensitive), 1-based position from get_page_sections, header path like 'Career/Early career', or the start or an approximate spelling of a header", min_length=1)],
     max_length: Annotated[int, Field(description="Maximum length of section content to return (default: 5000)", ge=100)] = 5000,
+    max_tokens: Annotated[int | None, Field(description="Approximate token budget; when set, the section and its subsections are packed whole in document order instead of cutting at max_length (optional)", ge=1)] = None,
     ctx: Context[ServerSession, AppContext] | None = None,
 ) -> CallToolResult:
     """Extract a specific section from an article by header name."""
@@ -493,43 +762,52 @@ async def get_page_section(
     await ctx.debug(f"Fetching section '{section_header}' from: '{slug}'")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=True)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}'")
             raise ValueError(f"Page not found: {slug}")
 
-        page = result.page
-        content = page.content or ""
-        
-        header_pattern = rf'^#+\s*{re.escape(section_header)}\s*$'
-        lines = content.split('\n')
-        
-        section_start = None
-        section_end = None
-        section_level = None
-        
-        for i, line in enumerate(lines):
-            if section_start is None:
-                if re.match(header_pattern, line, re.IGNORECASE):
-                    section_start = i
-                    section_level = len(line) - len(line.lstrip('#'))
-            elif section_start is not None:
-                if line.startswith('#'):
-                    current_level = len(line) - len(line.lstrip('#'))
-                    if section_level is not None and current_level <= section_level:
-                        section_end = i
-                        break
-        
-        if section_start is None:
+        page = cached.page
+        content, outline = await fetcher.derive(cached, lambda: (cached.content, cached.outline))
+        section = outline.resolve(section_header)
+        if section is None:
             await ctx.warning(f"Section '{section_header}' not found in '{slug}'")
+            candidates = [f"'{outline.path(c)}'" for c in outline.candidates(section_header)]
+            if candidates:
+                raise ValueError(
+                    f"Section '{section_header}' not found. Closest headers: {', '.join(candidates)}"
+                )
             raise ValueError(f"Section '{section_header}' not found")
         
-        if section_end is None:
-            section_end = len(lines)
-        
-        section_content = '\n'.join(lines[section_start:section_end]).strip()
+        if max_tokens is not None:
+            section_content, included, omitted = outline.pack(content, max_tokens, section)
+            packing, note = _describe_packing(included, omitted, max_tokens)
+            if omitted:
+                await ctx.warning(
+                    f"Token budget of {max_tokens} fits {len(included)} of "
+                    f"{len(included) + len(omitted)} parts of section '{section.header}'"
+                )
+            await ctx.info(f"Extracted section '{section.header}' from '{page.title}'")
+            structured = {
+                "slug": page.slug,
+                "title": page.title,
+                "section_header": section.header,
+                "section_path": outline.path(section),
+                "section_content": section_content,
+                "content_length": len(section_content),
+                **packing,
+            }
+            return CallToolResult(
+                content=[TextContent(
+                    type="text",
+                    text=f"# {page.title}\n## {section.header}\n\n{section_content}{note}",
+                )],
+                structuredContent=structured,
+            )
+
+        section_content = content[section.start:section.end].strip()
         section_len = len(section_content)
         is_truncated = section_len > max_length
         
@@ -539,16 +817,17 @@ async def get_page_section(
                 f"Section content truncated from {section_len} to {max_length} chars"
             )
         
-        await ctx.info(f"Extracted section '{section_header}' from '{page.title}'")
+        await ctx.info(f"Extracted section '{section.header}' from '{page.title}'")
         
-        text_output = f"# {page.title}\n## {section_header}\n\n{section_content}"
+        text_output = f"# {page.title}\n## {section.header}\n\n{section_content}"
         if is_truncated:
             text_output += f"\n\n... (truncated at {max_length} of {section_len} chars)"
         
         structured = {
             "slug": page.slug,
             "title": page.title,
-            "section_header": section_header,
+            "section_header": section.header,
+            "section_path": outline.path(section),
             "section_content": section_content,
             "content_length": len(section_content),
         }
@@ -576,6 +855,994 @@ async def get_page_section(
         raise RuntimeError(f"Grokipedia API error: {e}") from e
 
 
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def get_page_section_batch(
+    slug: Annotated[str, Field(description="Unique slug identifier of page to extract sections from")],
+    sections: Annotated[list[Annotated[str, Field(min_length=1)] | int], Field(description="Sections to return, in order: headers (case-insensitive), 1-based positions from get_page_sections, header paths like 'Career/Early career', or header prefixes and approximate spellings", min_length=1)],
+    max_length: Annotated[int, Field(description="Maximum total length of all returned section content (default: 10000)", ge=100)] = 10000,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Extract several sections from an article in one call, sharing one length budget."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Fetching {len(sections)} sections from: '{slug}'")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+
+        if cached is None:
+            await ctx.warning(f"Page not found: '{slug}'")
+            raise ValueError(f"Page not found: {slug}")
+
+        page = cached.page
+        content, outline = await fetcher.derive(cached, lambda: (cached.content, cached.outline))
+
+        found = []
+        not_found = []
+        for ref in sections:
+            section = outline.resolve(ref)
+            if section is None:
+                not_found.append({
+                    "requested": ref,
+                    "candidates": [outline.path(c) for c in outline.candidates(ref)],
+                })
+            else:
+                found.append((ref, section))
+
+        if not found:
+            await ctx.warning(f"None of the requested sections were found in '{slug}'")
+            raise ValueError(
+                f"Sections not found: {', '.join(str(item['requested']) for item in not_found)}. "
+                f"Closest headers: {', '.join(not_found[0]['candidates'])}"
+            )
+
+        remaining = max_length
+        results = []
+        text_parts = [f"# {page.title}"]
+        for ref, section in found:
+            section_content = content[section.start:section.end].strip()
+            section_len = len(section_content)
+            item = {
+                "requested": ref,
+                "section_header": section.header,
+                "section_path": outline.path(section),
+                "level": section.level,
+            }
+            if remaining <= 0:
+                item["_omitted"] = True
+                results.append(item)
+                continue
+
+            is_truncated = section_len > remaining
+            if is_truncated:
+                section_content = section_content[:remaining]
+                item["_truncated"] = True
+                item["_original_length"] = section_len
+            remaining -= len(section_content)
+            item["section_content"] = section_content
+            item["content_length"] = len(section_content)
+            results.append(item)
+
+            text_parts.extend(["", f"## {section.header}", "", section_content])
+            if is_truncated:
+                text_parts.append(f"\n... (truncated at {len(section_content)} of {section_len} chars)")
+
+        omitted = [item["section_header"] for item in results if item.get("_omitted")]
+        if omitted:
+            text_parts.append(f"\n... (omitted, length budget used up: {', '.join(omitted)})")
+            await ctx.warning(f"Length budget of {max_length} chars used up, omitted {len(omitted)} sections")
+        if not_found:
+            text_parts.append("\nSections not found:")
+            for item in not_found:
+                text_parts.append(
+                    f"- {item['requested']} (closest: {', '.join(item['candidates']) or 'none'})"
+                )
+            await ctx.warning(f"{len(not_found)} requested sections not found in '{slug}'")
+
+        await ctx.info(f"Extracted {len(results) - len(omitted)} sections from '{page.title}'")
+
+        structured = {
+            "slug": page.slug,
+            "title": page.title,
+            "sections": results,
+            "not_found": not_found,
+            "content_length": max_length - remaining,
+        }
+
+        return CallToolResult(
+            content=[TextContent(type="text", text="\n".join(text_parts))],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {slug}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid page slug: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def get_page_chunk_index(
+    slug: Annotated[str, Field(description="Unique slug identifier of page to chunk")],
+    max_chunk_chars: Annotated[int, Field(description="Maximum size of each chunk in characters (default: 2000)", ge=MIN_CHUNK_CHARS, le=MAX_CHUNK_CHARS)] = 2000,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """List an article's section-aligned chunks with stable ids, to fetch with get_page_chunks."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Fetching chunk index for: '{slug}' (max_chunk_chars={max_chunk_chars})")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+
+        if cached is None:
+            await ctx.warning(f"Page not found: '{slug}'")
+            raise ValueError(f"Page not found: {slug}")
+
+        page = cached.page
+        chunks = await fetcher.derive(cached, lambda: cached.chunks(max_chunk_chars))
+
+        await ctx.info(f"Split '{page.title}' into {len(chunks)} chunks")
+
+        text_parts = [f"# {page.title}", "", f"{len(chunks)} chunks (max {max_chunk_chars} chars):", ""]
+        for chunk in chunks:
+            text_parts.append(
+                f"- {chunk.id}: {chunk.section} ({chunk.size} chars, ~{chunk.tokens} tokens)"
+            )
+
+        structured = {
+            "slug": page.slug,
+            "title": page.title,
+            "max_chunk_chars": max_chunk_chars,
+            "chunks": [
+                {
+                    "id": chunk.id,
+                    "section": chunk.section,
+                    "start": chunk.start,
+                    "end": chunk.end,
+                    "size": chunk.size,
+                    "tokens": chunk.tokens,
+                }
+                for chunk in chunks
+            ],
+            "count": len(chunks),
+        }
+
+        return CallToolResult(
+            content=[TextContent(type="text", text="\n".join(text_parts))],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {slug}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid page slug: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def get_page_chunks(
+    slug: Annotated[str, Field(description="Unique slug identifier of page to read chunks from")],
+    chunk_ids: Annotated[list[str], Field(description="Chunk ids from get_page_chunk_index", min_length=1, max_length=100)],
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Get the text of specific chunks of an article by id."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Fetching {len(chunk_ids)} chunks from: '{slug}'")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+
+        if cached is None:
+            await ctx.warning(f"Page not found: '{slug}'")
+            raise ValueError(f"Page not found: {slug}")
+
+        page = cached.page
+        # Ids from one chunk index share a size, so a handful of sizes covers any real request.
+        sizes = list(dict.fromkeys(size for size in map(_chunk_size, chunk_ids) if size is not None))
+        sizes = sizes[:MAX_CHUNK_INDEXES]
+        content, indexes = await fetcher.derive(
+            cached, lambda: (cached.content, {size: cached.chunks(size) for size in sizes})
+        )
+
+        results = []
+        missing = []
+        for chunk_id in chunk_ids:
+            size = _chunk_size(chunk_id)
+            chunk = None
+            if size is not None:
+                chunk = next((c for c in indexes.get(size, ()) if c.id == chunk_id), None)
+            if chunk is None:
+                missing.append(chunk_id)
+                continue
+            results.append({
+                "id": chunk.id,
+                "section": chunk.section,
+                "start": chunk.start,
+                "end": chunk.end,
+                "content": content[chunk.start:chunk.end],
+            })
+
+        if not results:
+            await ctx.warning(f"None of the requested chunks exist in '{slug}'")
+            raise ValueError(
+                f"Chunks not found: {', '.join(missing)}. "
+                f"The page may have changed; call get_page_chunk_index again."
+            )
+
+        await ctx.info(f"Retrieved {len(results)} chunks from '{page.title}'")
+
+        text_parts = [f"# {page.title}"]
+        for item in results:
+            text_parts.extend(["", f"## [{item['id']}] {item['section']}", "", item["content"].strip()])
+        if missing:
+            await ctx.warning(f"{len(missing)} chunk ids not found in '{slug}'")
+            text_parts.append(f"\nChunks not found (page may have changed): {', '.join(missing)}")
+
+        structured = {
+            "slug": page.slug,
+            "title": page.title,
+            "chunks": results,
+            "not_found": missing,
+        }
+
+        return CallToolResult(
+            content=[TextContent(type="text", text="\n".join(text_parts))],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {slug}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid page slug: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def find_in_page(
+    slug: Annotated[str, Field(description="Unique slug identifier of page to search in")],
+    pattern: Annotated[str, Field(description="Term to look for, or a regular expression when regex is true (a search running longer than a second is abandoned)", min_length=1, max_length=MAX_PATTERN_CHARS)],
+    regex: Annotated[bool, Field(description="Treat pattern as a regular expression (default: false)")] = False,
+    case_sensitive: Annotated[bool, Field(description="Match case exactly (default: false)")] = False,
+    context_chars: Annotated[int, Field(description="Characters of surrounding context on each side of a match, within its paragraph (default: 200)", ge=0, le=2000)] = 200,
+    max_matches: Annotated[int, Field(description="Maximum number of matches to return (default: 20)", ge=1, le=100)] = 20,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Find a term or pattern inside an article and return matching snippets with their sections."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    matcher = _compile_pattern(pattern, regex, case_sensitive)
+
+    await ctx.debug(f"Searching '{slug}' for: '{pattern}' (regex={regex})")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+
+        if cached is None:
+            await ctx.warning(f"Page not found: '{slug}'")
+            raise ValueError(f"Page not found: {slug}")
+
+        page = cached.page
+        content, outline, lines = await fetcher.derive(
+            cached, lambda: (cached.content, cached.outline, cached.lines)
+        )
+
+        def scan() -> tuple[list, int]:
+            found, count = [], 0
+            deadline = time.monotonic() + REGEX_TIMEOUT
+            for match in matcher.finditer(content, timeout=REGEX_TIMEOUT, concurrent=True):
+                if time.monotonic() > deadline:
+                    raise TimeoutError
+                if match.start() == match.end():
+                    continue
+                count += 1
+                if len(found) < max_matches:
+                    found.append(match)
+            return found, count
+
+        # A caller's regex can be slow even on a short page, so it always
+        # leaves the event loop when there is a worker pool.
+        size = max(cached.length, fetcher.offload_chars) if regex else cached.length
+        try:
+            found, total_count = await fetcher.offload(size, scan)
+        except TimeoutError as e:
+            raise ValueError(
+                f"Pattern took longer than {REGEX_TIMEOUT:g}s to search the page; simplify it"
+            ) from e
+
+        matches = []
+        for match in found:
+            para_start, para_end = lines.paragraph(match.start())
+            section = outline.section_at(match.start())
+            if section is not None:
+                para_start = max(para_start, section.start)
+                para_end = min(para_end, section.body_end)
+            snippet_start = max(para_start, match.start() - context_chars)
+            snippet_end = min(para_end, match.end() + context_chars)
+            matches.append({
+                "match": match.group(0),
+                "start": match.start(),
+                "end": match.end(),
+                "line": lines.line_number(match.start()),
+                "section": "(lead)" if section is None else outline.path(section),
+                "snippet": content[snippet_start:snippet_end].strip(),
+                "snippet_start": snippet_start,
+            })
+
+        await ctx.info(f"Found {total_count} matches for '{pattern}' in '{page.title}'")
+
+        if not matches:
+            text_output = f"# {page.title}\n\nNo matches for '{pattern}'."
+        else:
+            header = f"# {page.title}\n\n"
+            if total_count > len(matches):
+                header += f"Showing {len(matches)} of {total_count} matches for '{pattern}':\n"
+            else:
+                header += f"Found {total_count} matches for '{pattern}':\n"
+
+            text_parts = [header]
+            for i, item in enumerate(matches, 1):
+                text_parts.append(f"{i}. [{item['section']}] (line {item['line']}, char {item['start']})")
+                text_parts.append(f"   {item['snippet']}")
+                text_parts.append("")
+            text_output = "\n".join(text_parts)
+
+        structured = {
+            "slug": page.slug,
+            "title": page.title,
+            "pattern": pattern,
+            "matches": matches,
+            "total_count": total_count,
+            "returned_count": len(matches),
+        }
+
+        if total_count > len(matches):
+            structured["_limited"] = True
+
+        return CallToolResult(
+            content=[TextContent(type="text", text=text_output)],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {slug}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid page slug: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def get_relevant_sections(
+    slug: Annotated[str, Field(description="Unique slug identifier of page to rank sections of")],
+    query: Annotated[str, Field(description="Question or keywords to rank the page's sections against", min_length=1)],
+    top_k: Annotated[int, Field(description="Maximum number of sections to return (default: 3)", ge=1, le=20)] = 3,
+    max_tokens: Annotated[int, Field(description="Approximate token budget for all returned section bodies (default: 2000)", ge=100)] = 2000,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Return the sections of an article most relevant to a question, ranked by BM25."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Ranking sections of '{slug}' for: '{query}' (top_k={top_k}, max_tokens={max_tokens})")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
+
+        if cached is None:
+            await ctx.warning(f"Page not found: '{slug}'")
+            raise ValueError(f"Page not found: {slug}")
+
+        page = cached.page
+        content, ranked = await fetcher.derive(
+            cached, lambda: (cached.content, cached.relevance.rank(query, top_k))
+        )
+
+        remaining = max_tokens
+        results = []
+        omitted = []
+        for segment, score in ranked:
+            if segment.tokens > remaining:
+                omitted.append({"section": segment.label, "score": round(score, 3), "tokens": segment.tokens})
+                continue
+            remaining -= segment.tokens
+            results.append({
+                "section": segment.label,
+                "score": round(score, 3),
+                "tokens": segment.tokens,
+                "section_content": content[segment.start:segment.end].strip(),
+            })
+
+        await ctx.info(f"Returning {len(results)} of {len(ranked)} matching sections from '{page.title}'")
+
+        if not ranked:
+            text_output = f"# {page.title}\n\nNo sections match '{query}'."
+        else:
+            text_parts = [f"# {page.title}"]
+            for item in results:
+                text_parts.extend(["", f"## {item['section']} (score {item['score']})", "", item["section_content"]])
+            if omitted:
+                text_parts.append(
+                    f"\n... (over the {max_tokens} token budget, omitted: "
+                    f"{', '.join(item['section'] for item in omitted)})"
+                )
+            text_output = "\n".join(text_parts)
+
+        structured = {
+            "slug": page.slug,
+            "title": page.title,
+            "query": query,
+            "sections": results,
+            "omitted_sections": omitted,
+            "max_tokens": max_tokens,
+            "token_estimate": max_tokens - remaining,
+        }
+
+        return CallToolResult(
+            content=[TextContent(type="text", text=text_output)],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {slug}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid page slug: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def get_pages(
+    slugs: Annotated[list[str], Field(description="Slugs of the pages to retrieve", min_length=1, max_length=50)],
+    max_content_length: Annotated[int, Field(description="Maximum length of content to return per page (default: 2000)", ge=0)] = 2000,
+    concurrency: Annotated[int, Field(description="Maximum number of pages fetched at once (default: 8)", ge=1, le=16)] = 8,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Get several pages in one call, fetched concurrently, with errors reported per page."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Fetching {len(slugs)} pages (concurrency={concurrency})")
+
+    fetcher = ctx.request_context.lifespan_context.fetcher
+    fetched = await fetcher.get_pages(
+        slugs, include_content=max_content_length > 0, concurrency=concurrency
+    )
+
+    results = []
+    text_parts = []
+    for slug, cached in fetched.items():
+        if cached is None or isinstance(cached, GrokipediaNotFoundError):
+            results.append({"slug": slug, "status": "not_found", "error": f"Page not found: {slug}"})
+            text_parts.extend([f"# {slug}", "", "Page not found.", ""])
+            continue
+        if isinstance(cached, GrokipediaBadRequestError):
+            error = f"Invalid page slug: {cached}"
+        elif isinstance(cached, GrokipediaNetworkError):
+            error = f"Failed to connect to Grokipedia API: {cached}"
+        elif isinstance(cached, Exception):
+            error = f"Grokipedia API error: {cached}"
+        else:
+            error = None
+        if error is not None:
+            await ctx.error(f"Failed to fetch '{slug}': {cached}")
+            results.append({"slug": slug, "status": "error", "error": error})
+            text_parts.extend([f"# {slug}", "", f"Error: {error}", ""])
+            continue
+
+        page = cached.page
+        item = page.model_dump()
+        item["status"] = "ok"
+        text_parts.extend([f"# {page.title}", "", f"**Slug:** {page.slug}"])
+        if page.description:
+            text_parts.extend(["", f"**Description:** {page.description}"])
+
+        if max_content_length > 0:
+            content = await fetcher.derive(cached, lambda: cached.content)
+            item["content"] = content[:max_content_length]
+            if len(content) > max_content_length:
+                item["_content_truncated"] = True
+                item["_original_length"] = len(content)
+            if content:
+                preview_length = min(500, max_content_length)
+                text_parts.extend(["", content[:preview_length]])
+                if len(content) > preview_length:
+                    text_parts.append(f"\n... (showing first {preview_length} of {len(content)} chars)")
+        if page.citations:
+            text_parts.extend(["", f"**Citations:** {len(page.citations)}"])
+        text_parts.append("")
+        results.append(item)
+
+    found_count = sum(1 for item in results if item["status"] == "ok")
+    await ctx.info(f"Retrieved {found_count} of {len(results)} pages")
+
+    structured = {
+        "pages": results,
+        "found_count": found_count,
+        "requested_count": len(results),
+    }
+
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(text_parts).rstrip())],
+        structuredContent=structured,
+    )
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def search_many(
+    queries: Annotated[list[str], Field(description="Search queries to run together, e.g. variants of one topic", min_length=1, max_length=10)],
+    limit: Annotated[int, Field(description="Maximum number of results per query (default: 10, max: 50)", ge=1, le=50)] = 10,
+    fusion: Annotated[str, Field(description="How to merge results: 'rrf' ranks by reciprocal-rank fusion, 'concat' keeps first-seen order (default: rrf)")] = "rrf",
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Run several searches concurrently and return per-query results plus one merged, deduplicated list."""
+    if ctx is None:
+        raise ValueError("Context is required")
+    if fusion not in ("rrf", "concat"):
+        raise ValueError(f"Invalid fusion: {fusion}. Use 'rrf' or 'concat'")
+
+    unique: dict[str, str] = {}
+    for query in queries:
+        unique.setdefault(search_key(query), query)
+    queries = list(unique.values())
+
+    await ctx.debug(f"Searching for {len(queries)} queries (limit={limit}, fusion={fusion})")
+
+    fetcher = ctx.request_context.lifespan_context.fetcher
+    outcomes = await asyncio.gather(
+        *(fetcher.search(query=query, limit=limit) for query in queries), return_exceptions=True
+    )
+
+    rankings = {}
+    errors = {}
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, GrokipediaBadRequestError):
+            errors[query] = f"Invalid search parameters: {outcome}"
+        elif isinstance(outcome, GrokipediaNetworkError):
+            errors[query] = f"Failed to connect to Grokipedia API: {outcome}"
+        elif isinstance(outcome, BaseException):
+            errors[query] = f"Grokipedia API error: {outcome}"
+        else:
+            rankings[query] = outcome
+    for query, error in errors.items():
+        await ctx.error(f"Search for '{query}' failed: {error}")
+    if not rankings:
+        raise RuntimeError(f"All searches failed: {'; '.join(errors.values())}")
+
+    merged = _fuse_rankings(rankings, fusion)
+
+    await ctx.info(f"Found {len(merged)} distinct results across {len(rankings)} queries")
+
+    text_lines = [f"Found {len(merged)} distinct results for {len(queries)} queries", ""]
+    for i, (item, score, found_by) in enumerate(merged, 1):
+        text_lines.append(f"{i}. {item.title}")
+        text_lines.append(f"   Slug: {item.slug}")
+        text_lines.append(f"   Snippet: {item.snippet}")
+        text_lines.append(f"   Found by: {', '.join(found_by)}")
+        if fusion == "rrf":
+            text_lines.append(f"   Fused score: {score:.4f}")
+        text_lines.append("")
+    for query, error in errors.items():
+        text_lines.append(f"Search for '{query}' failed: {error}")
+
+    structured = {
+        "results": [
+            {**item.model_dump(), "fused_score": round(score, 6), "queries": found_by}
+            for item, score, found_by in merged
+        ],
+        "by_query": {
+            query: [item.slug for item in results] for query, results in rankings.items()
+        },
+        "errors": errors,
+        "fusion": fusion,
+    }
+
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(text_lines).rstrip())],
+        structuredContent=structured,
+    )
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def compare_pages(
+    topic1: Annotated[str, Field(description="First topic, as a slug or a search query")],
+    topic2: Annotated[str, Field(description="Second topic, as a slug or a search query")],
+    lead_length: Annotated[int, Field(description="Maximum length of each page's lead section (default: 1500)", ge=0)] = 1500,
+    max_items: Annotated[int, Field(description="Maximum number of linked pages and citations listed per group (default: 25)", ge=1, le=200)] = 25,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Compare two topics side by side: outlines, leads, and shared and unique links and citations."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Comparing: '{topic1}' and '{topic2}'")
+
+    try:
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        (cached1, via1), (cached2, via2) = await asyncio.gather(
+            _resolve_topic(fetcher, topic1), _resolve_topic(fetcher, topic2)
+        )
+
+        sides = []
+        for topic, cached, via in ((topic1, cached1, via1), (topic2, cached2, via2)):
+            page = cached.page
+            content, outline = await fetcher.derive(
+                cached, lambda: (cached.content, cached.outline)
+            )
+            lead = content[:outline.lead_end].strip()
+            links = {}
+            for item in page.linked_pages or []:
+                slug, title = linked_page(item)
+                if slug:
+                    links.setdefault(slug.lower(), {"slug": slug, "title": title})
+            citations = {}
+            for citation in page.citations or []:
+                citations.setdefault(citation.url, {"title": citation.title, "url": citation.url})
+            sides.append({
+                "topic": topic,
+                "resolved_by": via,
+                "page": page,
+                "lead": lead[:lead_length],
+                "lead_truncated": len(lead) > lead_length,
+                "outline": [
+                    {"level": section.level, "path": outline.path(section)} for section in outline.sections
+                ],
+                "links": links,
+                "citations": citations,
+            })
+
+        first, second = sides
+
+        def split(key: str) -> dict:
+            ones, twos = first[key], second[key]
+            groups = {
+                "shared": [ones[k] for k in ones if k in twos],
+                "only_first": [ones[k] for k in ones if k not in twos],
+                "only_second": [twos[k] for k in twos if k not in ones],
+            }
+            return {
+                name: {"items": items[:max_items], "total_count": len(items)}
+                for name, items in groups.items()
+            }
+
+        linked_pages = split("links")
+        citations = split("citations")
+
+        await ctx.info(
+            f"Compared '{first['page'].title}' and '{second['page'].title}': "
+            f"{linked_pages['shared']['total_count']} shared links, "
+            f"{citations['shared']['total_count']} shared citations"
+        )
+
+        labels = {
+            "shared": "Shared",
+            "only_first": f"Only in {first['page'].title}",
+            "only_second": f"Only in {second['page'].title}",
+        }
+        text_parts = [f"# {first['page'].title} vs {second['page'].title}"]
+        for side in sides:
+            page = side["page"]
+            text_parts.extend(["", f"## {page.title} ({page.slug})"])
+            if side["resolved_by"] == "search":
+                text_parts.append(f"*Top search result for '{side['topic']}'*")
+            if side["lead"]:
+                text_parts.extend(["", side["lead"]])
+                if side["lead_truncated"]:
+                    text_parts.append("...")
+            if side["outline"]:
+                text_parts.extend(["", "**Outline:**"])
+                for entry in side["outline"]:
+                    text_parts.append(f"{'  ' * (entry['level'] - 1)}- {entry['path'].rsplit('/', 1)[-1]}")
+
+        for heading, groups, render in (
+            ("Linked Pages", linked_pages, lambda item: f"{item['title']} ({item['slug']})"),
+            ("Citations", citations, lambda item: f"{item['title']}: {item['url']}"),
+        ):
+            text_parts.extend(["", f"## {heading}"])
+            for name, group in groups.items():
+                text_parts.extend(["", f"**{labels[name]} ({group['total_count']}):**"])
+                text_parts.extend(f"- {render(item)}" for item in group["items"])
+                if group["total_count"] > len(group["items"]):
+                    text_parts.append(f"... and {group['total_count'] - len(group['items'])} more")
+
+        structured = {
+            "pages": [
+                {
+                    "topic": side["topic"],
+                    "resolved_by": side["resolved_by"],
+                    "slug": side["page"].slug,
+                    "title": side["page"].title,
+                    "lead": side["lead"],
+                    "outline": side["outline"],
+                    "linked_page_count": len(side["links"]),
+                    "citation_count": len(side["citations"]),
+                }
+                for side in sides
+            ],
+            "linked_pages": linked_pages,
+            "citations": citations,
+        }
+
+        return CallToolResult(
+            content=[TextContent(type="text", text="\n".join(text_parts))],
+            structuredContent=structured,
+        )
+
+    except GrokipediaNotFoundError as e:
+        await ctx.error(f"Page not found: {e}")
+        raise ValueError(f"Page not found: {e}") from e
+    except GrokipediaBadRequestError as e:
+        await ctx.error(f"Bad request: {e}")
+        raise ValueError(f"Invalid request: {e}") from e
+    except GrokipediaNetworkError as e:
+        await ctx.error(f"Network error: {e}")
+        raise RuntimeError(f"Failed to connect to Grokipedia API: {e}") from e
+    except GrokipediaAPIError as e:
+        await ctx.error(f"API error: {e}")
+        raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def crawl_links(
+    slug: Annotated[str, Field(description="Slug of the page to start crawling from")],
+    depth: Annotated[int, Field(description="Number of link hops to follow from the seed page (default: 2)", ge=1, le=4)] = 2,
+    max_pages: Annotated[int, Field(description="Maximum number of pages to fetch, including the seed (default: 25)", ge=1, le=200)] = 25,
+    concurrency: Annotated[int, Field(description="Maximum number of pages fetched at once (default: 8)", ge=1, le=16)] = 8,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Crawl linked pages breadth-first from a seed page and return the discovered link graph."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Crawling from: '{slug}' (depth={depth}, max_pages={max_pages}, concurrency={concurrency})")
+
+    fetcher = ctx.request_context.lifespan_context.fetcher
+    nodes: dict[str, dict] = {slug: {"slug": slug, "title": slug, "depth": 0}}
+    links: dict[str, list[str]] = {}
+    fetched = 0
+
+    async def on_result(node_slug: str, cached: CachedPage | Exception | None) -> None:
+        nonlocal fetched
+        fetched += 1
+        node = nodes[node_slug]
+        if cached is None or isinstance(cached, GrokipediaNotFoundError):
+            node["status"] = "not_found"
+        elif isinstance(cached, Exception):
+            node["status"] = "error"
+            node["error"] = str(cached)
+        else:
+            node["status"] = "ok"
+            node["title"] = cached.page.title
+            links[node_slug] = [
+                target for target, _ in map(linked_page, cached.page.linked_pages or []) if target
+            ]
+        await ctx.report_progress(fetched, max_pages, f"Fetched {node['title']}")
+
+    level = [slug]
+    for hop in range(depth + 1):
+        batch = level[:max_pages - fetched]
+        if not batch:
+            break
+        await fetcher.get_pages(batch, include_content=False, concurrency=concurrency, on_result=on_result)
+        if hop == depth:
+            break
+        level = []
+        for source in batch:
+            for target in links.get(source, []):
+                if target not in nodes:
+                    nodes[target] = {"slug": target, "title": target, "depth": hop + 1}
+                    level.append(target)
+
+    seed = nodes[slug]
+    if seed["status"] == "not_found":
+        await ctx.warning(f"Page not found: '{slug}'")
+        raise ValueError(f"Page not found: {slug}")
+    if seed["status"] == "error":
+        await ctx.error(f"Failed to fetch seed page: {seed['error']}")
+        raise RuntimeError(f"Grokipedia API error: {seed['error']}")
+
+    visited = [node for node in nodes.values() if "status" in node]
+    unvisited = len(nodes) - len(visited)
+    edges = [
+        {"source": source, "target": target}
+        for source, targets in links.items()
+        for target in dict.fromkeys(targets)
+        if target in nodes and "status" in nodes[target] and target != source
+    ]
+
+    await ctx.info(f"Crawled {len(visited)} pages with {len(edges)} links from '{slug}'")
+
+    text_parts = [
+        f"# Link graph from {nodes[slug]['title']}",
+        "",
+        f"Fetched {len(visited)} pages, {len(edges)} links between them"
+        + (f", {unvisited} more pages discovered but not fetched" if unvisited else ""),
+        "",
+    ]
+    out_degree = {node["slug"]: 0 for node in visited}
+    for edge in edges:
+        out_degree[edge["source"]] += 1
+    for node in visited:
+        line = f"{'  ' * node['depth']}- {node['title']} ({node['slug']})"
+        if node["status"] == "ok":
+            line += f" -> {out_degree[node['slug']]} links in graph"
+        else:
+            line += f" [{node['status'].replace('_', ' ')}]"
+        text_parts.append(line)
+
+    structured = {
+        "seed": slug,
+        "nodes": visited,
+        "edges": edges,
+        "fetched_count": len(visited),
+        "unvisited_count": unvisited,
+    }
+
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(text_parts))],
+        structuredContent=structured,
+    )
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True
+    )
+)
+async def find_link_path(
+    source: Annotated[str, Field(description="Slug of the page to start from")],
+    target: Annotated[str, Field(description="Slug of the page to reach")],
+    max_hops: Annotated[int, Field(description="Maximum number of links in the path (default: 6)", ge=1, le=10)] = 6,
+    max_fetches: Annotated[int, Field(description="Maximum number of pages to fetch while searching (default: 50)", ge=0, le=500)] = 50,
+    concurrency: Annotated[int, Field(description="Maximum number of pages fetched at once (default: 8)", ge=1, le=16)] = 8,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Find the shortest chain of links from one page to another."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    await ctx.debug(f"Finding link path: '{source}' -> '{target}' (max_hops={max_hops}, max_fetches={max_fetches})")
+
+    fetcher = ctx.request_context.lifespan_context.fetcher
+    if not fetcher.graph.enabled:
+        raise ValueError("The link graph is disabled on this server")
+
+    path, fetched = await fetcher.link_path(
+        source, target, max_hops=max_hops, max_fetches=max_fetches, concurrency=concurrency
+    )
+
+    if path is None:
+        await ctx.info(f"No link path found from '{source}' to '{target}' ({fetched} pages fetched)")
+        text_output = (
+            f"No path of at most {max_hops} links found from {source} to {target}.\n\n"
+            f"Searched {len(fetcher.graph)} known pages, fetching {fetched} of them."
+        )
+        if fetched >= max_fetches:
+            text_output += " The fetch budget was used up; a larger max_fetches may find a path."
+    else:
+        await ctx.info(f"Found a {len(path) - 1}-link path from '{source}' to '{target}'")
+        text_output = "\n".join([
+            f"# {source} -> {target}",
+            "",
+            f"{len(path) - 1} links ({fetched} pages fetched):",
+            "",
+            " -> ".join(path),
+        ])
+
+    structured = {
+        "source": source,
+        "target": target,
+        "path": path,
+        "hops": None if path is None else len(path) - 1,
+        "fetched_count": fetched,
+        "graph_pages": len(fetcher.graph),
+    }
+
+    return CallToolResult(
+        content=[TextContent(type="text", text=text_output)],
+        structuredContent=structured,
+    )
+
+
 # Prompts
 @mcp.prompt()
 def research_topic():
@@ -622,8 +1889,8 @@ def compare_topics(topic1: str = "Topic 1", topic2: str = "Topic 2"):
     return f"""I'll help you compare two topics from Grokipedia.
 
 I will:
-1. Retrieve articles for both {topic1} and {topic2}
-2. Compare their content, key points, and citations
+1. Call compare_pages with {topic1} and {topic2} to fetch both articles at once, with their outlines, leads, and shared and unique linked pages and citations
+2. Read the sections that matter for the comparison with get_page_section_batch or get_relevant_sections
 3. Highlight similarities and differences
 
 Please provide the two topics you want to compare (or confirm the suggestions above)."""
@@ -647,35 +1914,26 @@ async def get_page_sections(
     await ctx.debug(f"Fetching section headers for: '{slug}'")
 
     try:
-        client = ctx.request_context.lifespan_context.client
-        result = await client.get_page(slug=slug, include_content=True)
+        fetcher = ctx.request_context.lifespan_context.fetcher
+        cached = await fetcher.get_page(slug=slug, include_content=True)
 
-        if not result.found or result.page is None:
+        if cached is None:
             await ctx.warning(f"Page not found: '{slug}', searching for alternatives")
-            search_result = await client.search(query=slug, limit=5)
-            if search_result.results:
-                suggestions = [f"{r.title} ({r.slug})" for r in search_result.results[:3]]
-                await ctx.info(f"Found {len(search_result.results)} similar pages")
+            similar = await fetcher.suggest(slug)
+            if similar:
+                suggestions = [f"{r.title} ({r.slug})" for r in similar[:3]]
+                await ctx.info(f"Found {len(similar)} similar pages")
                 raise ValueError(
                     f"Page not found: {slug}. Did you mean one of these? {', '.join(suggestions)}"
                 )
             raise ValueError(f"Page not found: {slug}")
 
-        page = result.page
-        content = page.content or ""
-        
-        # Extract all markdown headers
-        lines = content.split('\n')
-        sections = []
-        
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("#"):
-                # Count the number of # symbols for header level
-                level = len(line) - len(line.lstrip("#"))
-                header_text = stripped.lstrip("#").strip()
-                if header_text:  # Only include non-empty headers
-                    sections.append({"level": level, "header": header_text})
+        page = cached.page
+        outline = await fetcher.derive(cached, lambda: cached.outline)
+        sections = [
+            {"level": section.level, "header": section.header}
+            for section in outline.sections
+        ]
 
         await ctx.info(f"Found {len(sections)} section headers in '{page.title}'")
 
@@ -720,3 +1978,120 @@ async def get_page_sections(
     except GrokipediaAPIError as e:
         await ctx.error(f"API error: {e}")
         raise RuntimeError(f"Grokipedia API error: {e}") from e
+
+
+def _format_cache_stats(stats: dict) -> list[str]:
+    lines = []
+    for name in ("pages", "searches", "not_found"):
+        cache = stats[name]
+        lookups = cache["hits"] + cache["misses"]
+        hit_rate = f"{cache['hits'] / lookups:.1%}" if lookups else "n/a"
+        lines.append(
+            f"- {name}: {cache['entries']} entries, {cache['bytes']} bytes, "
+            f"{cache['hits']} hits / {cache['misses']} misses ({hit_rate}), "
+            f"{cache['evictions']} evictions, {cache['expirations']} expirations"
+        )
+    lines.append(f"- in flight: {stats['inflight']}, background refreshes: {stats['refreshes']}")
+    graph = stats["link_graph"]
+    lines.append(f"- link graph: {graph['pages']} pages, {graph['links']} links")
+    disk = stats["disk"]
+    if disk is not None:
+        for kind, usage in sorted(disk["kinds"].items()):
+            lines.append(f"- disk {kind}: {usage['entries']} entries, {usage['bytes']} bytes")
+        lines.append(f"- disk pending writes: {disk['pending_writes']}")
+    return lines
+
+
+async def cache_admin(
+    action: Annotated[str, Field(description="'stats' to report cache usage, 'evict' to drop a slug and/or query, or 'clear' to empty every cache (default: stats)")] = "stats",
+    slug: Annotated[str | None, Field(description="Page slug to evict when action is 'evict'")] = None,
+    query: Annotated[str | None, Field(description="Search query to evict when action is 'evict'")] = None,
+    ctx: Context[ServerSession, AppContext] | None = None,
+) -> CallToolResult:
+    """Inspect the server's caches or evict entries from them."""
+    if ctx is None:
+        raise ValueError("Context is required")
+
+    fetcher = ctx.request_context.lifespan_context.fetcher
+    structured = {}
+
+    if action == "evict":
+        if slug is None and query is None:
+            raise ValueError("Provide a slug and/or a query to evict")
+        structured["evicted"] = fetcher.evict(slug=slug, query=query)
+        await ctx.info(f"Evicted slug={slug!r} query={query!r} from cache")
+    elif action == "clear":
+        structured["evicted"] = fetcher.clear()
+        await ctx.warning("Cleared every cache")
+    elif action != "stats":
+        raise ValueError(f"Unknown action: {action}. Use 'stats', 'evict' or 'clear'")
+
+    stats = fetcher.stats()
+    structured["stats"] = stats
+
+    text_parts = ["# Cache", ""]
+    if "evicted" in structured:
+        text_parts.extend([f"Evicted: {structured['evicted']}", ""])
+    text_parts.extend(_format_cache_stats(stats))
+
+    return CallToolResult(
+        content=[TextContent(type="text", text="\n".join(text_parts))],
+        structuredContent=structured,
+    )
+
+
+async def cache_admin_route(request: Request) -> JSONResponse:
+    """HTTP twin of the cache_admin tool.
+
+    ``GET`` returns cache statistics. ``DELETE`` evicts the ``slug`` and/or
+    ``query`` given as query parameters, or everything when neither is set.
+    Requests sent by a browser (anything carrying an ``Origin`` header) are
+    refused, and when ``settings.admin_token`` is set it must be given as a
+    bearer token.
+    """
+    if "origin" in request.headers:
+        return JSONResponse({"error": "Cross-origin requests are not allowed"}, status_code=403)
+    if settings.admin_token is not None:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {settings.admin_token}".encode()):
+            return JSONResponse(
+                {"error": "Unauthorized"}, status_code=401, headers={"WWW-Authenticate": "Bearer"}
+            )
+
+    context = _shared_context
+    if context is None:
+        return JSONResponse({"error": "Cache is not initialized"}, status_code=503)
+
+    body = {}
+    if request.method == "DELETE":
+        slug = request.query_params.get("slug")
+        query = request.query_params.get("query")
+        if slug is None and query is None:
+            body["evicted"] = context.fetcher.clear()
+        else:
+            body["evicted"] = context.fetcher.evict(slug=slug, query=query)
+    body["stats"] = context.fetcher.stats()
+    return JSONResponse(body)
+
+
+_admin_enabled = False
+
+
+def enable_admin() -> None:
+    """Register the cache_admin tool, which is off by default."""
+    global _admin_enabled
+    if _admin_enabled:
+        return
+    mcp.add_tool(
+        cache_admin,
+        annotations=ToolAnnotations(
+            readOnlyHint=False,
+            destructiveHint=True,
+            idempotentHint=True
+        ),
+    )
+    _admin_enabled = True
+
+
+if settings.enable_admin:
+    enable_admin()
@@ -0,0 +1,133 @@
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID
+"""
+
+# Bump whenever the stored value format changes; older files are wiped.
+_SCHEMA_VERSION = 7
+_BATCH_SIZE = 256
+
+
+class DiskStore:
+    """Persistent SQLite cache for fetched pages, search results and page links.
+
+    Reads run inline on the caller's thread. Writes are queued and committed in
+    batches by a background thread, so the event loop never waits on disk.
+    Values are JSON text encoded and decoded by the caller, so nothing read
+    back from the file can run code.
+    """
+
+    def __init__(self, path: str | Path, ttl: float):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self._conn = self._connect()
+        with self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS entries")
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("DELETE FROM entries WHERE fetched_at <= ?", (time.time() - ttl,))
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="grokipedia-cache-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        # The read connection is opened on the event loop thread but closed
+        # from a worker thread at shutdown; it is never used concurrently.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, kind: str, key: str) -> tuple[str, float] | None:
+        """Return ``(value, age_in_seconds)`` for a live entry, or None."""
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT value, fetched_at FROM entries WHERE kind = ? AND key = ? AND fetched_at > ?",
+            (kind, key, now - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], max(0.0, now - row[1])
+
+    def items(self, kind: str) -> list[tuple[str, str]]:
+        """Every live ``(key, value)`` of one kind, e.g. to rebuild an index at startup."""
+        return self._conn.execute(
+            "SELECT key, value FROM entries WHERE kind = ? AND fetched_at > ?",
+            (kind, time.time() - self.ttl),
+        ).fetchall()
+
+    def put(self, kind: str, key: str, value: str, age: float = 0.0) -> None:
+        self._queue.put(("put", kind, key, value, time.time() - age))
+
+    def delete(self, kind: str, key: str) -> None:
+        self._queue.put(("delete", kind, key))
+
+    def clear(self) -> None:
+        self._queue.put(("clear",))
+
+    def stats(self) -> dict:
+        rows = self._conn.execute(
+            "SELECT kind, COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries GROUP BY kind"
+        ).fetchall()
+        return {
+            "path": str(self.path),
+            "ttl": self.ttl,
+            "pending_writes": self._queue.qsize(),
+            "kinds": {kind: {"entries": count, "bytes": size} for kind, count, size in rows},
+        }
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread. Blocks until done."""
+        self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                ops = [self._queue.get()]
+                while ops[-1] is not None and len(ops) < _BATCH_SIZE:
+                    try:
+                        ops.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = ops[-1] is None
+                if stop:
+                    ops.pop()
+                if ops:
+                    with conn:
+                        for op in ops:
+                            self._apply(conn, op)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, op: tuple) -> None:
+        if op[0] == "put":
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, fetched_at) VALUES (?, ?, ?, ?)",
+                op[1:],
+            )
+        elif op[0] == "delete":
+            conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", op[1:])
+        elif op[0] == "clear":
+            conn.execute("DELETE FROM entries")